@@ -0,0 +1,85 @@
+"""Command-line mode for pipelines: python main.py <command> [options]
+    
+    ffmpeg -i in.flac -f wav - | python main.py audio-embed -p KEY -m "text" > out.wav
+    python main.py audio-extract -p KEY < out.wav
+    python main.py audio-scan /archive/wav --top 20
+"""
+import argparse
+import os
+import sys
+
+from ui_pages.audio_page import (STREAM_BLOCK_FRAMES, format_scan_report, scan_directory,
+                                 stream_lsb_decode, stream_lsb_encode)
+
+
+def _password(args):
+    """Password from the command line or the STEGO_PASSWORD environment variable"""
+    password = args.password or os.environ.get("STEGO_PASSWORD")
+    if not password:
+        raise SystemExit("error: a password is required (-p or STEGO_PASSWORD)")
+    return password
+
+
+def audio_embed(args):
+    """WAV on stdin -> WAV with the message in its first samples on stdout"""
+    if args.message_file:
+        with open(args.message_file, encoding='utf-8') as f:
+            message = f.read()
+    else:
+        message = args.message
+    
+    samples = stream_lsb_encode(sys.stdin.buffer, sys.stdout.buffer, message,
+                                _password(args), args.block_frames)
+    print(f"Embedded {len(message)} characters in the first {samples} samples", file=sys.stderr)
+    return 0
+
+
+def audio_extract(args):
+    """WAV on stdin -> hidden message on stdout"""
+    print(stream_lsb_decode(sys.stdin.buffer, _password(args), args.block_frames))
+    return 0
+
+
+def audio_scan(args):
+    """Rank the WAV files under a folder by steganalysis score"""
+    reports = scan_directory(args.folder, workers=args.workers)
+    if args.top:
+        reports = reports[:args.top]
+    print(format_scan_report(reports) if reports else "No WAV files found.")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="main.py", description="Cyber Steganography command-line mode")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    embed = commands.add_parser("audio-embed", help="hide a message in a WAV/RF64/Wave64 stream (stdin -> stdout)")
+    source = embed.add_mutually_exclusive_group(required=True)
+    source.add_argument("-m", "--message", help="message to hide")
+    source.add_argument("--message-file", help="read the message from a UTF-8 text file")
+    embed.set_defaults(handler=audio_embed)
+    
+    extract = commands.add_parser("audio-extract", help="read a message from a WAV/RF64/Wave64 stream on stdin")
+    extract.set_defaults(handler=audio_extract)
+    
+    scan = commands.add_parser("audio-scan", help="rank WAV files in a folder by LSB steganalysis score")
+    scan.add_argument("folder", help="folder to scan recursively")
+    scan.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    scan.add_argument("--top", type=int, help="only list the N most suspicious files")
+    scan.set_defaults(handler=audio_scan)
+    
+    for command in (embed, extract):
+        command.add_argument("-p", "--password", help="encryption key (default: $STEGO_PASSWORD)")
+        command.add_argument("--block-frames", type=int, default=STREAM_BLOCK_FRAMES,
+                             help=f"frames per processing block (default: {STREAM_BLOCK_FRAMES})")
+    return parser
+
+
+def run(argv):
+    """Parse argv and run the selected command; returns the exit code"""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
@@ -1,3 +1,4 @@
+import sys
 import tkinter as tk
 from tkinter import messagebox
 
@@ -143,6 +144,11 @@ class SteganographyApp(tk.Tk):
 
 # ===== APP ENTRY POINT =====
 def main():
+    # Any arguments select the command-line mode (see cli.py)
+    if len(sys.argv) > 1:
+        from cli import run
+        sys.exit(run(sys.argv[1:]))
+
     app = SteganographyApp()
     app.mainloop()
 
@@ -1,13 +1,184 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 import os
 import struct
-import wave
 import numpy as np
+from scipy import fft, signal
 import base64
 from cryptography.fernet import Fernet
 import hashlib
 import random
+import threading
+import queue
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+# Sony Wave64 GUIDs: the riff id and the suffix shared by the standard chunk GUIDs
+W64_RIFF_GUID = b"riff\x2e\x91\xcf\x11\xa5\xd6\x28\xdb\x04\xc1\x00\x00"
+W64_CHUNK_SUFFIX = b"\xf3\xac\xd3\x11\x8c\xd1\x00\xc0\x4f\x8e\xdb\x8a"
+WAV_EXTENSIONS = ('.wav', '.rf64', '.w64')
+# Output extension and file dialog label per container; every encoder keeps the source's
+CONTAINER_OUTPUTS = {
+    "RIFF": ('.wav', "WAV Audio Files"),
+    "RF64": ('.rf64', "RF64 Audio Files"),
+    "W64": ('.w64', "Wave64 Audio Files"),
+}
+# Compressed formats that can still carry a spread-spectrum payload (read via ffmpeg)
+LOSSY_EXTENSIONS = ('.mp3', '.m4a', '.aac', '.ogg', '.opus', '.flac')
+
+# Longest first segment phase coding will use (~24 s at 44.1 kHz), and the samples
+# after it over which its change fades out (~23 ms)
+PHASE_MAX_SEGMENT = 1 << 20
+PHASE_FADE = 1024
+
+# Spread-spectrum STFT layout: frame size and hop, chipped band (bins), frames
+# per bit group, bits per group, frames each chip is held, payload repetitions,
+# target correlation per bit and closed-loop embedding passes
+SS_NPERSEG = 2048
+SS_HOP = 1024
+SS_BAND = (16, 400)
+SS_FRAMES = 8
+SS_BITS = 8
+SS_HOLD = 2
+SS_REPEAT = 3
+SS_STRENGTH = 0.12
+SS_PASSES = 4
+SS_PREAMBLE = np.array([1, 0, 1, 1, 0, 0, 1, 0, 1, 1, 1, 0, 0, 0, 1, 0] * 2, dtype=np.uint8)
+# Codec delay the decoder searches for, in samples
+SS_SYNC_RANGE = 4096
+# Carrier rates retried for compressed copies whose codec resampled them
+# (Opus always decodes at 48 kHz, low-bitrate MP3 drops to 22.05/24 kHz)
+SS_DECODE_RATES = (44100, 48000, 32000, 22050, 24000, 16000, 88200, 96000)
+
+# Frames per block for the stdin/stdout pipeline (~93 ms at 44.1 kHz)
+STREAM_BLOCK_FRAMES = 4096
+
+# Frames per steganalysis block (statistics are reported per block)
+SCAN_BLOCK_SAMPLES = 1 << 20
+
+# Trace sets C_m (|m| <= SPA_TRACE_SETS, i.e. pairs differing by up to ~2x that)
+# pooled by sample pair analysis, and the z-score a block's SPA statistic must
+# reach before its rate estimate counts
+SPA_TRACE_SETS = 32
+SPA_MIN_Z = 4.0
+
+# Frames per bucket at the finest waveform pyramid level, and the coarsest level's size
+WAVEFORM_BASE = 256
+WAVEFORM_MIN_BUCKETS = 1024
+
+
+class OperationCancelled(Exception):
+    """Raised inside a worker when the user presses Cancel"""
+
+
+# ===== CRYPTOGRAPHY (shared by the page and the streaming pipeline) =====
+
+def generate_key(password: str) -> bytes:
+    """Generate a Fernet key from a password"""
+    password_bytes = password.encode('utf-8')
+    hashed = hashlib.sha256(password_bytes).digest()
+    key = base64.urlsafe_b64encode(hashed)
+    return key
+
+
+def encrypt_message(message: str, password: str) -> str:
+    """Encrypt message using Fernet"""
+    try:
+        f = Fernet(generate_key(password))
+        token = f.encrypt(message.encode('utf-8'))
+        return token.decode('utf-8')
+    except Exception as e:
+        raise Exception(f"Encryption failed: {str(e)}")
+
+
+def decrypt_message(token: str, password: str) -> str:
+    """Decrypt message using Fernet"""
+    try:
+        f = Fernet(generate_key(password))
+        message = f.decrypt(token.encode('utf-8'))
+        return message.decode('utf-8')
+    except Exception as e:
+        raise Exception(f"Decryption failed: {str(e)}")
+
+
+def fernet_message_capacity(token_size, encoded=True):
+    """Longest message (UTF-8 bytes) whose Fernet token fits in token_size bytes.
+    
+    Fernet adds 57 bytes and pads the message to whole 16-byte blocks; the token is
+    base64 text unless encoded is False (spread spectrum embeds the raw bytes).
+    """
+    raw = token_size // 4 * 3 if encoded else token_size
+    return max(0, (raw - 57) // 16 * 16 - 1)
+
+
+# ===== WAV LAYOUT =====
+
+def read_wav_layout(audio_path, f=None):
+    """Parse the chunk table of a RIFF, RF64/BW64 or Wave64 file (header reads only).
+    
+    Pass an open binary handle as f to parse through it instead of reopening.
+    """
+    if f is None:
+        with open(audio_path, 'rb') as f:
+            return read_wav_layout(audio_path, f)
+    
+    file_size = os.fstat(f.fileno()).st_size
+    f.seek(0)
+    header = f.read(40)
+    if header[:16] == W64_RIFF_GUID and header[24:40] == b"wave" + W64_CHUNK_SUFFIX:
+        # Sony Wave64: GUID chunk ids, 64-bit sizes that include the header, 8-byte alignment
+        container, pos, header_size, align = "W64", 40, 24, 8
+    elif header[:4] in (b"RIFF", b"RF64", b"BW64") and header[8:12] == b"WAVE":
+        container = "RIFF" if header[:4] == b"RIFF" else "RF64"
+        pos, header_size, align = 12, 8, 2
+    else:
+        raise ValueError("Not a RIFF/RF64/Wave64 WAVE file")
+    
+    layout = {"container": container, "chunks": [], "data_offset": None, "data_size": 0}
+    ds64_sizes = {}
+    while pos + header_size <= file_size:
+        f.seek(pos)
+        if container == "W64":
+            guid, chunk_size = struct.unpack("<16sQ", f.read(24))
+            chunk_id = guid[:4] if guid[4:] == W64_CHUNK_SUFFIX else guid
+            chunk_size -= 24
+            if chunk_size < 0:
+                break
+        else:
+            chunk_id, chunk_size = struct.unpack("<4sI", f.read(8))
+            # RF64 keeps the real size of oversized chunks in ds64
+            if chunk_size == 0xFFFFFFFF and chunk_id in ds64_sizes:
+                chunk_size = ds64_sizes[chunk_id]
+        
+        payload = pos + header_size
+        layout["chunks"].append((chunk_id, payload, chunk_size))
+        
+        if chunk_id == b"ds64":
+            _, data_size, _, table_length = struct.unpack("<QQQI", f.read(28))
+            ds64_sizes[b"data"] = data_size
+            for _ in range(table_length):
+                table_id, table_size = struct.unpack("<4sQ", f.read(12))
+                ds64_sizes[table_id] = table_size
+            layout["ds64_offset"] = payload
+        elif chunk_id == b"fmt ":
+            fmt_tag, channels, framerate, _, _, bits = struct.unpack("<HHIIHH", f.read(16))
+            layout.update(format_tag=fmt_tag, channels=channels,
+                          framerate=framerate, sampwidth=(bits + 7) // 8)
+        elif chunk_id == b"data" and layout["data_offset"] is None:
+            layout["data_offset"] = payload
+            # Streamed WAVs leave the size as 0 or 0xFFFFFFFF
+            layout["data_size"] = min(chunk_size or file_size, file_size - payload)
+        
+        pos = payload + chunk_size
+        pos += -pos % align
+    
+    if "channels" not in layout or layout["data_offset"] is None:
+        raise ValueError("WAV file has no fmt or data chunk")
+    
+    layout["nframes"] = layout["data_size"] // (layout["channels"] * layout["sampwidth"])
+    return layout
+
 
 class AudioPage(tk.Frame):
     def __init__(self, parent, controller):
@@ -22,6 +193,20 @@ class AudioPage(tk.Frame):
         self.output_audio_path = ""
         self.encoded_audio_path = ""
         
+        # Background job state
+        self.job_in_progress = False
+        self.cancel_event = threading.Event()
+        self.job_queue = queue.Queue()
+        
+        # WAV header cache shared by the UI and workers
+        self.audio_info_cache = {}
+        self.audio_info_lock = threading.Lock()
+        
+        # Waveform pyramids (same keys as the header cache) and known payload
+        # regions (abspath -> (start frame, stop frame, method)) for the overview
+        self.waveform_cache = {}
+        self.payload_regions = {}
+        
         # Setup page
         self.setup_page()
     
@@ -67,7 +252,7 @@ class AudioPage(tk.Frame):
         # Method info
         method_info = tk.Label(
             header_frame,
-            text="📌 LSB: Sample-based hiding | 📌 Chunk: WAV metadata injection",
+            text="📌 LSB: Sample-based hiding | 📌 Spread: Keyed whole-track LSB | 📌 Phase: Spectrum phase coding | 📌 Spectrum: Lossy-safe spread spectrum | 📌 Chunk: WAV metadata injection",
             font=("Segoe UI", 10, "italic"),
             fg="#ffaa00",
             bg=self.COLORS['bg']
@@ -250,6 +435,9 @@ class AudioPage(tk.Frame):
         
         methods = [
             ("LSB (Sample-based Hiding)", "LSB"),
+            ("LSB Spread (Keyed, Whole Track)", "Spread"),
+            ("Phase Coding (Survives Gain & Noise)", "Phase"),
+            ("Spread Spectrum (Survives MP3/AAC)", "Spectrum"),
             ("Chunk Injection (WAV Metadata)", "Chunk")
         ]
         
@@ -466,6 +654,22 @@ class AudioPage(tk.Frame):
             command=self.show_encoded_audio_info
         ).pack(side="right", padx=(0, 5))
         
+        # Waveform overview button
+        tk.Button(
+            encoded_frame,
+            text="📈",
+            font=("Arial", 9),
+            fg=self.COLORS['secondary'],
+            bg=self.COLORS['card_bg'],
+            activeforeground=self.COLORS['primary'],
+            activebackground="#2a3546",
+            borderwidth=1,
+            relief="raised",
+            cursor="hand2",
+            width=3,
+            command=self.show_waveform
+        ).pack(side="right", padx=(0, 5))
+        
         # ===== DECODING METHOD SELECTION =====
         tk.Label(
             parent,
@@ -698,10 +902,37 @@ class AudioPage(tk.Frame):
         )
         self.status_label.pack(side="left", padx=20)
         
+        # Progress bar
+        self.progress_var = tk.IntVar()
+        self.progress_bar = ttk.Progressbar(
+            footer_frame,
+            variable=self.progress_var,
+            maximum=100,
+            length=150,
+            mode='determinate'
+        )
+        self.progress_bar.pack(side="left", padx=10)
+        
+        # Cancel button
+        self.cancel_btn = tk.Button(
+            footer_frame,
+            text="⛔ Cancel",
+            font=("Segoe UI", 9),
+            fg=self.COLORS['accent'],
+            bg=self.COLORS['bg'],
+            activeforeground=self.COLORS['primary'],
+            activebackground=self.COLORS['bg'],
+            borderwidth=0,
+            cursor="hand2",
+            state="disabled",
+            command=self.cancel_job
+        )
+        self.cancel_btn.pack(side="left")
+        
         # Method info
         method_info = tk.Label(
             footer_frame,
-            text="🔧 LSB: 1-bit per sample | 🔧 Chunk: WAV metadata injection",
+            text="🔧 LSB: 1-bit per sample | 🔧 Spread: keyed stride | 🔧 Phase: first-segment FFT | 🔧 Spectrum: STFT chips | 🔧 Chunk: WAV metadata injection",
             font=("Segoe UI", 9),
             fg="#666666",
             bg=self.COLORS['bg']
@@ -722,6 +953,21 @@ class AudioPage(tk.Frame):
             command=self.clear_all_fields
         )
         clear_all_btn.pack(side="right", padx=20)
+        
+        # Steganalysis scan button
+        scan_btn = tk.Button(
+            footer_frame,
+            text="🔎 Scan Folder",
+            font=("Segoe UI", 9),
+            fg=self.COLORS['secondary'],
+            bg=self.COLORS['bg'],
+            activeforeground=self.COLORS['primary'],
+            activebackground=self.COLORS['bg'],
+            borderwidth=0,
+            cursor="hand2",
+            command=self.scan_folder
+        )
+        scan_btn.pack(side="right")
     
     # ===== EVENT HANDLERS =====
     
@@ -766,6 +1012,12 @@ class AudioPage(tk.Frame):
         method = self.method_var.get()
         if method == "LSB":
             self.method_info_label.config(text="1 LSB bit per audio sample")
+        elif method == "Spread":
+            self.method_info_label.config(text="Keyed LSB positions spread across the whole track")
+        elif method == "Phase":
+            self.method_info_label.config(text="Message in the phases of the first segment's spectrum")
+        elif method == "Spectrum":
+            self.method_info_label.config(text="Keyed STFT chips - output can be shared as MP3/AAC")
         else:  # Chunk
             self.method_info_label.config(text="Custom chunk in WAV metadata")
     
@@ -776,13 +1028,13 @@ class AudioPage(tk.Frame):
         file_path = filedialog.askopenfilename(
             title="Select Source WAV Audio",
             filetypes=[
-                ("WAV Audio Files", "*.wav"),
+                ("WAV Audio Files", "*.wav *.rf64 *.w64"),
                 ("All Files", "*.*")
             ]
         )
         if file_path:
             # Check if file is WAV
-            if not file_path.lower().endswith('.wav'):
+            if not file_path.lower().endswith(WAV_EXTENSIONS):
                 messagebox.showwarning("Invalid Format", "Please select a WAV audio file.")
                 return
             
@@ -794,48 +1046,63 @@ class AudioPage(tk.Frame):
             
             # Load and display audio info
             try:
-                with wave.open(file_path, 'rb') as audio:
-                    info = f"Channels: {audio.getnchannels()} | Sample Rate: {audio.getframerate()} Hz | Duration: {audio.getnframes()/audio.getframerate():.1f}s"
-                    self.update_status(info, "info")
-                    
-                    # Calculate LSB capacity
-                    total_samples = audio.getnframes() * audio.getnchannels()
-                    capacity = total_samples // 8  # 1 bit per sample, 8 bits per byte
-                    self.update_status(f"LSB capacity: ~{capacity} characters", "info")
+                layout = self.get_audio_info(file_path)
+                info = f"Channels: {layout['channels']} | Sample Rate: {layout['framerate']} Hz | Duration: {layout['nframes']/layout['framerate']:.1f}s"
+                self.update_status(info, "info")
+                
+                # Calculate LSB capacity
+                capacity = self.calculate_lsb_capacity("LSB")
+                self.update_status(f"LSB capacity: ~{capacity} characters", "info")
             except Exception as e:
                 self.update_status(f"Error loading audio: {str(e)}", "error")
     
     def select_output_audio(self):
-        """Select output audio path (WAV only)"""
+        """Select output audio path, in the source's container"""
+        extension, label = self._output_format(self.source_audio_path)
         file_path = filedialog.asksaveasfilename(
             title="Save Encoded WAV Audio As",
-            defaultextension=".wav",
-            filetypes=[
-                ("WAV Audio Files", "*.wav"),
-            ]
+            defaultextension=extension,
+            filetypes=[(label, "*" + extension)]
         )
         if file_path:
-            # Ensure .wav extension
-            if not file_path.lower().endswith('.wav'):
-                file_path += '.wav'
+            file_path = self._output_path(file_path, self.source_audio_path)
             
             self.output_entry.delete(0, tk.END)
             self.output_entry.insert(0, file_path)
             self.output_entry.config(fg=self.COLORS['text'])
             self.output_audio_path = file_path
     
+    def _output_format(self, source_file):
+        """(extension, dialog label) of source_file's container; plain WAV if it cannot be read"""
+        try:
+            container = self.get_audio_info(source_file)["container"]
+        except Exception:
+            container = "RIFF"
+        return CONTAINER_OUTPUTS[container]
+    
+    def _output_path(self, file_path, source_file):
+        """file_path with the extension of the container the encoders write for source_file"""
+        extension = self._output_format(source_file)[0]
+        root, current = os.path.splitext(file_path)
+        if current.lower() == extension:
+            return file_path
+        if current.lower() in WAV_EXTENSIONS:
+            return root + extension
+        return file_path + extension
+    
     def select_encoded_audio(self):
-        """Select encoded audio for decoding (WAV only)"""
+        """Select encoded audio for decoding (WAV, or a compressed spread-spectrum copy)"""
         file_path = filedialog.askopenfilename(
             title="Select Encoded WAV Audio",
             filetypes=[
-                ("WAV Audio Files", "*.wav"),
+                ("WAV Audio Files", "*.wav *.rf64 *.w64"),
+                ("Compressed Audio Files", "*.mp3 *.m4a *.aac *.ogg *.opus *.flac"),
                 ("All Files", "*.*")
             ]
         )
         if file_path:
-            # Check if file is WAV
-            if not file_path.lower().endswith('.wav'):
+            # Check if file is WAV or a compressed copy
+            if not file_path.lower().endswith(WAV_EXTENSIONS + LOSSY_EXTENSIONS):
                 messagebox.showwarning("Invalid Format", "Please select a WAV audio file.")
                 return
             
@@ -852,17 +1119,20 @@ class AudioPage(tk.Frame):
             return
         
         try:
-            with wave.open(self.source_audio_path, 'rb') as audio:
-                info = f"""
+            layout = self.get_audio_info(self.source_audio_path)
+            compression = {1: "not compressed", 3: "IEEE float", 0xFFFE: "extensible"}.get(
+                layout["format_tag"], f"format 0x{layout['format_tag']:04x}")
+            info = f"""
 Audio Information:
-• Channels: {audio.getnchannels()}
-• Sample Width: {audio.getsampwidth()} bytes
-• Frame Rate: {audio.getframerate()} Hz
-• Frames: {audio.getnframes()}
-• Duration: {audio.getnframes() / audio.getframerate():.2f} seconds
-• Compression: {audio.getcompname()}
-                """
-                messagebox.showinfo("Audio Information", info.strip())
+• Channels: {layout['channels']}
+• Sample Width: {layout['sampwidth']} bytes
+• Frame Rate: {layout['framerate']} Hz
+• Frames: {layout['nframes']}
+• Duration: {layout['nframes'] / layout['framerate']:.2f} seconds
+• Compression: {compression}
+• Chunks: {', '.join(cid.decode('ascii', 'replace').strip() for cid, _, _ in layout['chunks'])}
+            """
+            messagebox.showinfo("Audio Information", info.strip())
         except Exception as e:
             messagebox.showerror("Error", f"Failed to read audio file:\n{str(e)}")
     
@@ -873,16 +1143,17 @@ Audio Information:
             return
         
         try:
-            with wave.open(self.encoded_audio_path, 'rb') as audio:
-                info = f"""
+            layout = self.get_audio_info(self.encoded_audio_path)
+            info = f"""
 Audio Information:
-• Channels: {audio.getnchannels()}
-• Sample Width: {audio.getsampwidth()} bytes
-• Frame Rate: {audio.getframerate()} Hz
-• Frames: {audio.getnframes()}
-• Duration: {audio.getnframes() / audio.getframerate():.2f} seconds
-                """
-                messagebox.showinfo("Audio Information", info.strip())
+• Channels: {layout['channels']}
+• Sample Width: {layout['sampwidth']} bytes
+• Frame Rate: {layout['framerate']} Hz
+• Frames: {layout['nframes']}
+• Duration: {layout['nframes'] / layout['framerate']:.2f} seconds
+• Chunks: {', '.join(cid.decode('ascii', 'replace').strip() for cid, _, _ in layout['chunks'])}
+            """
+            messagebox.showinfo("Audio Information", info.strip())
         except Exception as e:
             messagebox.showerror("Error", f"Failed to read audio file:\n{str(e)}")
     
@@ -925,14 +1196,15 @@ Audio Information:
         count = len(text)
         self.hide_char_count.config(text=f"Characters: {count}")
         
-        # Change color based on length
+        # Change color based on length (capacities are in UTF-8 bytes)
         method = self.method_var.get()
-        if method == "LSB" and self.source_audio_path:
-            max_chars = self.calculate_lsb_capacity()
-            if count > max_chars:
+        if method in ("LSB", "Spread", "Spectrum") and self.source_audio_path:
+            max_chars = self.calculate_lsb_capacity(method)
+            size = len(text.encode('utf-8'))
+            if size > max_chars:
                 self.hide_char_count.config(fg=self.COLORS['accent'])
                 self.hide_char_count.config(text=f"Characters: {count} (Exceeds capacity: {max_chars})")
-            elif count > max_chars * 0.8:
+            elif size > max_chars * 0.8:
                 self.hide_char_count.config(fg="#ffaa00")
             else:
                 self.hide_char_count.config(fg="#666666")
@@ -944,22 +1216,28 @@ Audio Information:
             else:
                 self.hide_char_count.config(fg="#666666")
     
-    def calculate_lsb_capacity(self):
-        """Calculate LSB capacity for current audio"""
+    def calculate_lsb_capacity(self, method="LSB"):
+        """Longest message (UTF-8 bytes) the current audio can carry with method.
+        
+        Each method embeds the Fernet token, so its room is converted back to message bytes.
+        """
         if not self.source_audio_path:
             return 0
         
         try:
-            with wave.open(self.source_audio_path, 'rb') as audio:
-                total_samples = audio.getnframes() * audio.getnchannels()
-                
-                # Total bits available (1 bit per sample)
-                total_bits = total_samples
-                # Convert to characters (8 bits per char)
-                # Account for ###END### marker (8*8 = 64 bits)
-                max_chars = (total_bits - 64) // 8
-                
-                return max_chars
+            layout = self.get_audio_info(self.source_audio_path)
+            total_samples = layout["nframes"] * layout["channels"]
+            
+            if method == "Spread":
+                # Odd samples carry the length header, even samples the token
+                return fernet_message_capacity((total_samples // 2) // 8)
+            
+            if method == "Spectrum":
+                # The raw token bytes are embedded, not their base64 text
+                return fernet_message_capacity(self.ss_capacity(layout["nframes"]), encoded=False)
+            
+            # One token bit per sample, followed by the ###END### marker
+            return fernet_message_capacity(total_samples // 8 - len("###END###"))
         except:
             return 0
     
@@ -981,170 +1259,666 @@ Audio Information:
     
     def generate_key(self, password: str) -> bytes:
         """Generate a Fernet key from a password"""
-        password_bytes = password.encode('utf-8')
-        hashed = hashlib.sha256(password_bytes).digest()
-        key = base64.urlsafe_b64encode(hashed)
-        return key
+        return generate_key(password)
     
     def encrypt_message(self, message: str, password: str) -> str:
         """Encrypt message using Fernet"""
-        try:
-            key = self.generate_key(password)
-            f = Fernet(key)
-            token = f.encrypt(message.encode('utf-8'))
-            return token.decode('utf-8')
-        except Exception as e:
-            raise Exception(f"Encryption failed: {str(e)}")
+        return encrypt_message(message, password)
     
     def decrypt_message(self, token: str, password: str) -> str:
         """Decrypt message using Fernet"""
-        try:
-            key = self.generate_key(password)
-            f = Fernet(key)
-            message = f.decrypt(token.encode('utf-8'))
-            return message.decode('utf-8')
-        except Exception as e:
-            raise Exception(f"Decryption failed: {str(e)}")
+        return decrypt_message(token, password)
+    
+    # ===== WAV LAYOUT METHODS =====
+    
+    def read_wav_layout(self, audio_path, f=None):
+        """Parse the chunk table of a RIFF, RF64/BW64 or Wave64 file (header reads only)"""
+        return read_wav_layout(audio_path, f)
+    
+    def _update_container_size(self, f, layout, file_size):
+        """Rewrite the top-level size field after the file grew"""
+        if layout["container"] == "W64":
+            f.seek(16)
+            f.write(struct.pack("<Q", file_size))
+        elif layout["container"] == "RF64":
+            f.seek(layout["ds64_offset"])
+            f.write(struct.pack("<Q", file_size - 8))
+        elif file_size - 8 <= 0xFFFFFFFF:
+            f.seek(4)
+            f.write(struct.pack("<I", file_size - 8))
+        else:
+            # Promote to RF64 using the JUNK chunk writers reserve for a ds64
+            junk = [c for c in layout["chunks"] if c[0] in (b"JUNK", b"junk") and c[2] >= 28
+                    and c[1] < layout["data_offset"]]
+            if not junk:
+                raise ValueError("Carrier would exceed 4 GB - save it as RF64 or W64 first")
+            f.seek(0)
+            f.write(b"RF64" + struct.pack("<I", 0xFFFFFFFF))
+            f.seek(junk[0][1] - 8)
+            f.write(b"ds64" + struct.pack("<I", junk[0][2]))
+            f.write(struct.pack("<QQQI", file_size - 8, layout["data_size"], layout["nframes"], 0))
+    
+    def get_audio_info(self, audio_path, f=None):
+        """Cached WAV layout keyed by (path, mtime, size) - no file reads on a hit"""
+        stat = os.fstat(f.fileno()) if f is not None else os.stat(audio_path)
+        key = (os.path.abspath(audio_path), stat.st_mtime_ns, stat.st_size)
+        
+        with self.audio_info_lock:
+            layout = self.audio_info_cache.get(key)
+        if layout is None:
+            layout = self.read_wav_layout(audio_path, f)
+            with self.audio_info_lock:
+                self.audio_info_cache[key] = layout
+        return layout
     
     # ===== LSB STEGANOGRAPHY METHODS =====
     
-    def lsb_encode(self, audio_path, message):
+    def lsb_encode(self, audio_path, message, output_path, password):
         """LSB encoding method for WAV audio"""
         try:
-            # Read audio file
-            with wave.open(audio_path, 'rb') as audio:
-                params = audio.getparams()
-                frames = audio.readframes(audio.getnframes())
+            layout = self.get_audio_info(audio_path)
+            if layout["sampwidth"] not in (1, 2):
+                raise ValueError(f"Unsupported sample width: {layout['sampwidth']}")
             
             # Encrypt the message
-            password = self.hide_password.get()
-            encrypted_message = self.encrypt_message(message, password) + "###END###"
+            token = self.encrypt_message(message, password)
+            encrypted_message = token + "###END###"
             
-            # Convert to binary
-            binary_message = ''.join(format(ord(c), '08b') for c in encrypted_message)
-            
-            # Convert audio frames to numpy array
-            if params.sampwidth == 2:  # 16-bit
-                audio_data = np.frombuffer(frames, dtype=np.int16)
-            elif params.sampwidth == 1:  # 8-bit
-                audio_data = np.frombuffer(frames, dtype=np.uint8)
-            else:
-                raise ValueError(f"Unsupported sample width: {params.sampwidth}")
+            # Convert to bits
+            bits = np.unpackbits(np.frombuffer(encrypted_message.encode('utf-8'), dtype=np.uint8))
             
             # Check capacity
-            if len(binary_message) > len(audio_data):
-                raise ValueError(f"Message too long! Capacity: {len(audio_data)//8} chars, Needed: {len(binary_message)//8} chars")
-            
-            # Apply LSB encoding
-            encoded_audio = audio_data.copy()
-            for i in range(len(binary_message)):
-                encoded_audio[i] = (audio_data[i] & ~1) | int(binary_message[i])
-            
-            # Convert back to bytes
-            if params.sampwidth == 2:
-                encoded_frames = encoded_audio.astype(np.int16).tobytes()
-            else:
-                encoded_frames = encoded_audio.astype(np.uint8).tobytes()
+            total_samples = layout["nframes"] * layout["channels"]
+            if len(bits) > total_samples:
+                raise ValueError(f"Message too long! Capacity: {total_samples//8} chars, Needed: {len(bits)//8} chars")
             
-            return encoded_frames, params
+            # Copy the carrier, then set the LSB of the first samples
+            self._copy_with_progress(audio_path, output_path, "Writing audio")
+            self._write_sample_lsbs(output_path, layout, np.arange(len(bits), dtype=np.int64), bits)
             
+            return token
+        
+        except OperationCancelled:
+            raise
         except Exception as e:
             raise Exception(f"LSB encoding failed: {str(e)}")
     
     def lsb_decode(self, audio_path):
         """LSB decoding method for WAV audio"""
         try:
-            # Read audio file
-            with wave.open(audio_path, 'rb') as audio:
-                params = audio.getparams()
-                frames = audio.readframes(audio.getnframes())
-            
-            # Convert audio frames to numpy array
-            if params.sampwidth == 2:
-                audio_data = np.frombuffer(frames, dtype=np.int16)
-            elif params.sampwidth == 1:
-                audio_data = np.frombuffer(frames, dtype=np.uint8)
-            else:
-                raise ValueError(f"Unsupported sample width: {params.sampwidth}")
-            
-            # Extract LSB bits
-            binary_message = ""
-            for sample in audio_data:
-                binary_message += str(sample & 1)
-            
-            # Convert binary to string
-            chars = []
-            for i in range(0, len(binary_message), 8):
-                byte = binary_message[i:i+8]
-                if len(byte) < 8:
-                    break
-                chars.append(chr(int(byte, 2)))
-                if ''.join(chars[-8:]).endswith("###END###"):
-                    break
+            with open(audio_path, 'rb') as f:
+                layout = self.get_audio_info(audio_path, f)
+                f.seek(layout["data_offset"])
+                return self._lsb_read_message(f, layout)
+        
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"LSB decoding failed: {str(e)}")
+    
+    def _lsb_read_message(self, f, layout, raw=b""):
+        """Collect sample LSBs from f up to the end marker.
+        
+        raw holds data bytes the caller already read from the start of the data
+        chunk (a whole number of message bytes); f must sit right after them.
+        """
+        sampwidth = layout["sampwidth"]
+        if sampwidth not in (1, 2):
+            raise ValueError(f"Unsupported sample width: {sampwidth}")
+        
+        marker = b"###END###"
+        message = bytearray()
+        block_bytes = 8 * sampwidth * 131072  # whole bytes of message per block
+        data_size = layout["data_size"] - layout["data_size"] % sampwidth
+        done = len(raw)
+        if not raw:
+            raw = f.read(min(block_bytes, data_size))
+            done = len(raw)
+        
+        while raw:
+            # Extract LSB bits of this block and pack them into bytes
+            lsb_bits = np.frombuffer(raw, dtype=np.uint8)[::sampwidth] & 1
+            search_from = max(0, len(message) - len(marker) + 1)
+            message += np.packbits(lsb_bits[:len(lsb_bits) - len(lsb_bits) % 8]).tobytes()
+            
+            # Only the newly added bytes (plus overlap) need searching
+            index = message.find(marker, search_from)
+            if index != -1:
+                return message[:index].decode('utf-8')
             
-            encrypted_message = ''.join(chars).replace("###END###", "")
+            # Every token starts with "gAAAAA", so clean audio stops here
+            if len(message) >= 6 and not message.startswith(b"gAAAAA"):
+                break
+            
+            self._report_progress(done, data_size, "Scanning LSB samples")
+            raw = f.read(min(block_bytes, data_size - done))
+            done += len(raw)
+        
+        raise Exception("No LSB marker found")
+    
+    # ===== SPREAD LSB METHODS =====
+    
+    def _spread_positions(self, password, total_samples, n_bits):
+        """Keyed sample indices for the spread layout.
+        
+        The 32-bit length header sits on odd samples and the payload on even
+        samples. Every bit gets its own stride window across the whole track
+        and a keyed offset inside it, so both parties can rebuild the indices
+        from the password and the sample count alone.
+        """
+        half = total_samples // 2
+        header_stride = half // 32
+        if header_stride < 1:
+            raise ValueError("Audio too short for spread LSB")
+        
+        seed = hashlib.sha256(b"spread-lsb:" + password.encode('utf-8')).digest()
+        rng = np.random.default_rng(int.from_bytes(seed[:8], "little"))
+        
+        header_pos = 2 * (np.arange(32, dtype=np.int64) * header_stride
+                          + rng.integers(0, header_stride, 32)) + 1
+        if n_bits == 0:
+            return header_pos, np.empty(0, dtype=np.int64)
+        
+        stride = half // n_bits
+        if stride < 1:
+            raise ValueError(f"Message too long! Capacity: {half // 8} chars, Needed: {n_bits // 8} chars")
+        payload_pos = 2 * (np.arange(n_bits, dtype=np.int64) * stride
+                           + rng.integers(0, stride, n_bits))
+        return header_pos, payload_pos
+    
+    def _write_sample_lsbs(self, audio_path, layout, positions, bits):
+        """Set the LSB of the given samples in place, touching only their pages"""
+        samples = np.memmap(audio_path, dtype=np.uint8, mode='r+',
+                            offset=layout["data_offset"], shape=(layout["data_size"],))
+        # Little-endian PCM keeps the LSB in the first byte of each sample
+        order = np.argsort(positions, kind="stable")
+        index = positions[order] * layout["sampwidth"]
+        samples[index] = (samples[index] & 0xFE) | bits[order]
+        samples.flush()
+        del samples
+    
+    def _read_sample_lsbs(self, audio_path, layout, positions):
+        """Read the LSB of the given samples by seeking straight to them"""
+        samples = np.memmap(audio_path, dtype=np.uint8, mode='r',
+                            offset=layout["data_offset"], shape=(layout["data_size"],))
+        bits = samples[positions * layout["sampwidth"]] & 1
+        del samples
+        return bits
+    
+    def lsb_spread_encode(self, audio_path, message, output_path, password):
+        """Spread LSB encoding across the whole track"""
+        try:
+            layout = self.get_audio_info(audio_path)
+            if layout["format_tag"] not in (1, 0xFFFE):
+                raise Exception("Spread LSB needs PCM audio")
+            
+            # Encrypt the message
+            encrypted_message = self.encrypt_message(message, password)
+            token = encrypted_message.encode('utf-8')
+            
+            total_samples = layout["nframes"] * layout["channels"]
+            payload_bits = np.unpackbits(np.frombuffer(token, dtype=np.uint8))
+            header_bits = np.unpackbits(np.frombuffer(struct.pack(">I", len(token)), dtype=np.uint8))
+            header_pos, payload_pos = self._spread_positions(password, total_samples, len(payload_bits))
+            
+            # Copy the carrier, then patch only the selected samples
+            self._copy_with_progress(audio_path, output_path, "Writing audio")
+            self._write_sample_lsbs(
+                output_path, layout,
+                np.concatenate([header_pos, payload_pos]),
+                np.concatenate([header_bits, payload_bits])
+            )
             return encrypted_message
+        
+        except (ValueError, OperationCancelled):
+            raise
+        except Exception as e:
+            raise Exception(f"Spread LSB encoding failed: {str(e)}")
+    
+    def lsb_spread_decode(self, audio_path, password):
+        """Spread LSB decoding - reads only the keyed sample positions"""
+        try:
+            layout = self.get_audio_info(audio_path)
+            total_samples = layout["nframes"] * layout["channels"]
+            
+            header_pos, _ = self._spread_positions(password, total_samples, 0)
+            header = np.packbits(self._read_sample_lsbs(audio_path, layout, header_pos)).tobytes()
+            length = struct.unpack(">I", header)[0]
+            if length == 0 or length * 8 > total_samples // 2:
+                raise Exception("No spread LSB header found")
             
+            _, payload_pos = self._spread_positions(password, total_samples, length * 8)
+            token = np.packbits(self._read_sample_lsbs(audio_path, layout, payload_pos)).tobytes()
+            if not token.startswith(b"gAAAAA"):
+                raise Exception("No spread LSB payload found")
+            
+            return token.decode('utf-8')
+        
         except Exception as e:
-            raise Exception(f"LSB decoding failed: {str(e)}")
+            raise Exception(f"Spread LSB decoding failed: {str(e)}")
+    
+    # ===== PHASE CODING METHODS =====
+    
+    def _sample_view(self, audio_path, layout, mode='r'):
+        """Memory-mapped (frames, channels) view of the PCM samples"""
+        dtypes = {1: np.uint8, 2: np.dtype('<i2')}
+        if layout["sampwidth"] not in dtypes:
+            raise ValueError(f"Unsupported sample width: {layout['sampwidth']}")
+        
+        frame_bytes = layout["channels"] * layout["sampwidth"]
+        return np.memmap(audio_path, dtype=dtypes[layout["sampwidth"]], mode=mode,
+                         offset=layout["data_offset"],
+                         shape=(layout["data_size"] // frame_bytes, layout["channels"]))
+    
+    def _phase_segment_length(self, n_bits):
+        """Smallest power-of-two segment whose lower quarter band holds n_bits"""
+        length = 256
+        while length // 4 < n_bits + 1:
+            length *= 2
+        return length
+    
+    def phase_encode(self, audio_path, message, output_path, password):
+        """Phase coding - payload in the phases of the first segment's spectrum"""
+        try:
+            layout = self.get_audio_info(audio_path)
+            
+            # Encrypt the message (raw token bytes, 16-bit length header)
+            encrypted_message = self.encrypt_message(message, password)
+            token = base64.urlsafe_b64decode(encrypted_message)
+            payload = struct.pack(">H", len(token)) + token
+            bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+            
+            segment = self._phase_segment_length(len(bits))
+            if segment > PHASE_MAX_SEGMENT or layout["nframes"] < segment:
+                raise ValueError(f"Message too long for phase coding! Needs {segment} frames per segment")
+            
+            self._copy_with_progress(audio_path, output_path, "Copying audio")
+            samples = self._sample_view(output_path, layout, 'r+')
+            dc, low, high = (128, 0, 255) if layout["sampwidth"] == 1 else (0, -32768, 32767)
+            
+            # Target phases for the first segment: +pi/2 for 0, -pi/2 for 1
+            bins = np.arange(1, len(bits) + 1)
+            target = np.where(bits == 0, np.pi / 2, -np.pi / 2)
+            original = samples[:segment].astype(np.float64) - dc
+            spectrum = fft.rfft(original, axis=0)
+            
+            # The first channel's per-bin shift is applied to every channel, so the
+            # channels keep their phase relationship
+            rotation = np.exp(1j * (target - np.angle(spectrum[bins, 0])))
+            spectrum[bins] *= rotation[:, None]
+            
+            # Near-silent bins would lose their phase to rounding, so give them a floor
+            floor = 0.5 * max(np.median(np.abs(spectrum[1:segment // 2, 0])), 64 * np.sqrt(segment))
+            spectrum[bins] = np.maximum(np.abs(spectrum[bins]), floor) * np.exp(1j * np.angle(spectrum[bins]))
+            change = fft.irfft(spectrum, n=segment, axis=0) - original
+            samples[:segment] = np.clip(np.rint(original + change + dc), low, high)
+            
+            # Only the payload segment is coded; its final offset fades out over the
+            # samples after it, so it joins the untouched audio without a click
+            fade = min(PHASE_FADE, layout["nframes"] - segment)
+            if fade:
+                ramp = 0.5 + 0.5 * np.cos(np.linspace(0, np.pi, fade + 2)[1:-1])
+                tail = samples[segment:segment + fade].astype(np.float64) + change[-1] * ramp[:, None]
+                samples[segment:segment + fade] = np.clip(np.rint(tail), low, high)
+            self._report_progress(1, 1, "Phase coding")
+            
+            samples.flush()
+            del samples
+            return encrypted_message
+        
+        except (ValueError, OperationCancelled):
+            raise
+        except Exception as e:
+            raise Exception(f"Phase encoding failed: {str(e)}")
+    
+    def phase_decode(self, audio_path):
+        """Phase decoding - tries each segment length on the first samples only"""
+        try:
+            layout = self.get_audio_info(audio_path)
+            samples = self._sample_view(audio_path, layout)
+            dc = 128 if layout["sampwidth"] == 1 else 0
+            first = samples[:min(PHASE_MAX_SEGMENT, len(samples)), 0].astype(np.float64) - dc
+            del samples
+            
+            segment = 256
+            while segment <= len(first):
+                phases = np.angle(fft.rfft(first[:segment])[1:segment // 4])
+                bits = (phases < 0).astype(np.uint8)
+                length = struct.unpack(">H", np.packbits(bits[:16]).tobytes())[0]
+                n_bits = 16 + 8 * length
+                
+                # The header must agree with the segment length it was read from
+                if length and self._phase_segment_length(n_bits) == segment:
+                    token = np.packbits(bits[16:n_bits]).tobytes()
+                    if token.startswith(b"\x80\x00\x00\x00"):
+                        return base64.urlsafe_b64encode(token).decode('utf-8')
+                segment *= 2
+            
+            raise Exception("No phase-coded payload found")
+        
+        except Exception as e:
+            raise Exception(f"Phase decoding failed: {str(e)}")
+    
+    # ===== SPREAD SPECTRUM METHODS =====
+    
+    def _ss_region(self, n_bits):
+        """Bit groups and leading samples needed for n_bits of spread-spectrum data"""
+        groups = -(-n_bits // SS_BITS)
+        return groups, (groups * SS_FRAMES + 2) * SS_HOP
+    
+    def _ss_chips(self, password, groups):
+        """Keyed +/-1 chips of shape (groups, SS_FRAMES, band bins)"""
+        seed = hashlib.sha256(b"spread-spectrum:" + password.encode('utf-8')).digest()
+        rng = np.random.default_rng(int.from_bytes(seed[:8], 'big'))
+        slots = SS_FRAMES // SS_HOLD
+        
+        # Every bin is +1 in exactly half the slots of a group, so the host's own
+        # spectrum cancels out of the correlation
+        order = rng.random((groups, slots, SS_BAND[1] - SS_BAND[0])).argsort(axis=1)
+        chips = np.where(order < slots // 2, 1.0, -1.0)
+        return np.repeat(chips, SS_HOLD, axis=1)
+    
+    def _ss_correlate(self, mono, chips):
+        """Correlation of every bit's log-magnitude band with its chips"""
+        groups = len(chips)
+        n_frames = groups * SS_FRAMES
+        n_samples = (n_frames + 2) * SS_HOP
+        mono = np.pad(mono[:n_samples], (0, max(0, n_samples - len(mono))))
+        
+        _, _, spectrum = signal.stft(mono, nperseg=SS_NPERSEG, noverlap=SS_NPERSEG - SS_HOP)
+        band = np.abs(spectrum[SS_BAND[0]:SS_BAND[1], 1:1 + n_frames]).T
+        logmag = np.log(band + 1e-9).reshape(chips.shape)
+        
+        corr = np.einsum('gfb,gfb->gb', logmag, chips).reshape(groups, SS_BITS, -1)
+        return corr.sum(axis=2).reshape(-1) / (SS_FRAMES * corr.shape[2])
+    
+    def _ss_sync(self, mono, chips):
+        """Codec delay (offset, correlations) at which the preamble locks, or (None, None)"""
+        # Lossy codecs shift the signal by their delay, so search for the preamble
+        best = None
+        preamble = 2.0 * SS_PREAMBLE - 1
+        for offset in range(0, SS_SYNC_RANGE, 64):
+            corr = self._ss_correlate(mono[offset:], chips)
+            score = np.dot(corr[:len(preamble)], preamble)
+            if best is None or score > best[0]:
+                best = (score, offset, corr)
+        
+        _, offset, corr = best
+        if np.sum((corr[:len(preamble)] > 0) == SS_PREAMBLE) < len(preamble) - 4:
+            return None, None
+        return offset, corr
+    
+    def _ss_load_mono(self, audio_path, n_samples, rate=None):
+        """First n_samples of the carrier as a DC-free mono float signal.
+        
+        Compressed carriers decode at their native rate unless rate is given.
+        """
+        if audio_path.lower().endswith(WAV_EXTENSIONS):
+            layout = self.get_audio_info(audio_path)
+            samples = self._sample_view(audio_path, layout)
+            dc = 128 if layout["sampwidth"] == 1 else 0
+            mono = samples[:n_samples].astype(np.float64).mean(axis=1) - dc
+            del samples
+            return mono
+        
+        # Compressed carriers are decoded by ffmpeg, stopping once enough is read
+        resample = ['-ar', str(rate)] if rate else []
+        try:
+            proc = subprocess.Popen(
+                ['ffmpeg', '-v', 'error', '-i', audio_path, '-f', 's16le', '-ac', '1', *resample, '-'],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        except FileNotFoundError:
+            raise Exception("ffmpeg is required to read compressed audio")
+        raw = proc.stdout.read(2 * n_samples)
+        proc.kill()
+        proc.wait()
+        return np.frombuffer(raw[:len(raw) // 2 * 2], dtype='<i2').astype(np.float64)
+    
+    def ss_capacity(self, nframes):
+        """Largest token (bytes) a carrier of nframes can hold"""
+        groups = (nframes // SS_HOP - 2) // SS_FRAMES
+        payload_bits = (groups * SS_BITS - len(SS_PREAMBLE)) // SS_REPEAT - 16
+        return min(max(0, payload_bits // 8), 0xFFFF)
+    
+    def ss_encode(self, audio_path, message, output_path, password):
+        """Spread spectrum - keyed chips on the STFT log magnitudes, survives MP3/AAC"""
+        try:
+            layout = self.get_audio_info(audio_path)
+            
+            # Preamble, then the length header and the raw token, each repeated
+            encrypted_message = self.encrypt_message(message, password)
+            token = base64.urlsafe_b64decode(encrypted_message)
+            header = np.unpackbits(np.frombuffer(struct.pack(">H", len(token)), dtype=np.uint8))
+            body = np.unpackbits(np.frombuffer(token, dtype=np.uint8))
+            bits = np.concatenate([SS_PREAMBLE, np.tile(header, SS_REPEAT), np.tile(body, SS_REPEAT)])
+            
+            if len(token) > self.ss_capacity(layout["nframes"]):
+                raise ValueError("Message too long for spread spectrum! Use a longer audio file")
+            
+            groups, n_samples = self._ss_region(len(bits))
+            signs = np.pad(2.0 * bits - 1, (0, groups * SS_BITS - len(bits)))
+            chips = self._ss_chips(password, groups)
+            n_frames = groups * SS_FRAMES
+            
+            self._copy_with_progress(audio_path, output_path, "Copying audio")
+            samples = self._sample_view(output_path, layout, 'r+')
+            dc, low, high = (128, 0, 255) if layout["sampwidth"] == 1 else (0, -32768, 32767)
+            
+            # Only the leading region carries chips; the rest of the track is untouched
+            region = samples[:n_samples].astype(np.float64).T - dc
+            _, _, spectrum = signal.stft(region, nperseg=SS_NPERSEG, noverlap=SS_NPERSEG - SS_HOP)
+            
+            # Closed loop: re-measure the marked signal and raise the gain of every
+            # bit the host spectrum is still fighting
+            amp = np.zeros(len(signs))
+            marked = region
+            for step in range(SS_PASSES):
+                corr = self._ss_correlate(marked.mean(axis=0), chips)
+                amp += np.where(signs * corr < SS_STRENGTH, signs * SS_STRENGTH - corr, 0)
+                amp = np.clip(amp, -4 * SS_STRENGTH, 4 * SS_STRENGTH)
+                
+                per_bin = np.repeat(amp.reshape(groups, SS_BITS), chips.shape[2] // SS_BITS, axis=1)
+                gain = np.ones(spectrum.shape[-2:])
+                gain[SS_BAND[0]:SS_BAND[1], 1:1 + n_frames] = np.exp(chips * per_bin[:, None, :]).reshape(n_frames, -1).T
+                
+                _, marked = signal.istft(spectrum * gain, nperseg=SS_NPERSEG, noverlap=SS_NPERSEG - SS_HOP)
+                marked = marked[:, :n_samples]
+                self._report_progress(step + 1, SS_PASSES, "Spread spectrum")
+            
+            samples[:n_samples] = np.clip(np.rint(marked.T + dc), low, high)
+            samples.flush()
+            del samples
+            return encrypted_message
+        
+        except (ValueError, OperationCancelled):
+            raise
+        except Exception as e:
+            raise Exception(f"Spread spectrum encoding failed: {str(e)}")
+    
+    def ss_decode(self, audio_path, password):
+        """Spread spectrum decoding - preamble sync, then soft-combined repetitions"""
+        try:
+            head_bits = len(SS_PREAMBLE) + 16 * SS_REPEAT
+            head_groups, head_samples = self._ss_region(head_bits)
+            chips = self._ss_chips(password, head_groups)
+            
+            # A codec may have resampled the carrier: try its native rate, then
+            # the usual carrier rates until the preamble locks
+            rates = (None,) if audio_path.lower().endswith(WAV_EXTENSIONS) else (None,) + SS_DECODE_RATES
+            for rate in rates:
+                mono = self._ss_load_mono(audio_path, head_samples + SS_SYNC_RANGE, rate)
+                offset, corr = self._ss_sync(mono, chips)
+                if offset is not None:
+                    break
+            else:
+                raise Exception("No spread-spectrum preamble found")
+            
+            header = corr[len(SS_PREAMBLE):head_bits].reshape(SS_REPEAT, 16).sum(axis=0) > 0
+            length = struct.unpack(">H", np.packbits(header).tobytes())[0]
+            n_bits = head_bits + SS_REPEAT * 8 * length
+            groups, n_samples = self._ss_region(n_bits)
+            
+            mono = self._ss_load_mono(audio_path, offset + n_samples, rate)
+            if not length or len(mono) < offset + n_samples - SS_HOP:
+                raise Exception("Invalid spread-spectrum length header")
+            
+            corr = self._ss_correlate(mono[offset:], self._ss_chips(password, groups))
+            body = corr[head_bits:n_bits].reshape(SS_REPEAT, -1).sum(axis=0) > 0
+            token = np.packbits(body).tobytes()
+            if not token.startswith(b"\x80\x00\x00\x00"):
+                raise Exception("No spread-spectrum payload found")
+            
+            return base64.urlsafe_b64encode(token).decode('utf-8')
+        
+        except Exception as e:
+            raise Exception(f"Spread spectrum decoding failed: {str(e)}")
     
     # ===== CHUNK INJECTION METHODS =====
     
-    def chunk_encode(self, audio_path, message):
+    def chunk_encode(self, audio_path, message, output_path, password):
         """Chunk injection encoding method"""
         try:
-            # Read the entire audio file
-            with open(audio_path, 'rb') as f:
-                audio_data = f.read()
+            layout = self.get_audio_info(audio_path)
             
             # Encrypt the message
-            password = self.hide_password.get()
             encrypted_message = self.encrypt_message(message, password)
-            
-            # Create custom chunk
-            chunk_id = b"steg"  # Custom chunk ID
             message_bytes = encrypted_message.encode('utf-8')
-            chunk_size = struct.pack("<I", len(message_bytes))
             
-            # Append chunk to audio data
-            encoded_data = audio_data + chunk_id + chunk_size + message_bytes
+            # Create custom chunk ("steg"), sized the way the container expects
+            if layout["container"] == "W64":
+                chunk = b"steg" + W64_CHUNK_SUFFIX + struct.pack("<Q", 24 + len(message_bytes)) + message_bytes
+                align = 8
+            else:
+                chunk = b"steg" + struct.pack("<I", len(message_bytes)) + message_bytes
+                align = 2
+            chunk += b"\0" * (-len(chunk) % align)
             
-            return encoded_data
+            # Copy the audio, append the chunk and fix the container size
+            self._copy_with_progress(audio_path, output_path, "Copying audio")
+            with open(output_path, 'r+b') as f:
+                f.seek(0, os.SEEK_END)
+                f.write(b"\0" * (-f.tell() % align))
+                f.write(chunk)
+                self._update_container_size(f, layout, f.tell())
             
+            return encrypted_message
+        
+        except OperationCancelled:
+            raise
         except Exception as e:
             raise Exception(f"Chunk encoding failed: {str(e)}")
     
     def chunk_decode(self, audio_path):
         """Chunk injection decoding method"""
         try:
-            # Read the entire audio file
-            with open(audio_path, 'rb') as f:
-                data = f.read()
-            
-            # Look for our custom chunk
-            chunk_id = b"steg"
-            index = data.rfind(chunk_id)
+            # Look for our custom chunk in the chunk table
+            layout = self.get_audio_info(audio_path)
+            steg_chunks = [c for c in layout["chunks"] if c[0] == b"steg"]
             
-            if index == -1:
+            if not steg_chunks:
                 raise Exception("No steganography chunk found")
             
-            # Extract chunk size
-            chunk_size = struct.unpack("<I", data[index+4:index+8])[0]
-            
             # Extract message
-            message_start = index + 8
-            message_end = message_start + chunk_size
-            encrypted_message = data[message_start:message_end].decode('utf-8')
+            _, offset, size = steg_chunks[-1]
+            with open(audio_path, 'rb') as f:
+                f.seek(offset)
+                encrypted_message = f.read(size).decode('utf-8')
             
             return encrypted_message
-            
+        
         except Exception as e:
             raise Exception(f"Chunk decoding failed: {str(e)}")
     
+    # ===== BACKGROUND JOB HELPERS =====
+    
+    def _start_job(self, target, *args):
+        """Run target on a worker thread and start draining its UI queue"""
+        self.job_in_progress = True
+        self.cancel_event.clear()
+        self.progress_var.set(0)
+        self.cancel_btn.config(state="normal")
+        
+        threading.Thread(target=target, args=args, daemon=True).start()
+        self.after(50, self._poll_job_queue)
+    
+    def _finish_job(self):
+        """Reset job state (Tk thread)"""
+        self.job_in_progress = False
+        self.cancel_btn.config(state="disabled")
+    
+    def _post(self, handler, *args):
+        """Queue a UI update for the Tk thread (worker side)"""
+        self.job_queue.put((handler, args))
+    
+    def _poll_job_queue(self):
+        """Apply queued worker updates on the Tk thread"""
+        try:
+            while True:
+                handler, args = self.job_queue.get_nowait()
+                handler(*args)
+        except queue.Empty:
+            pass
+        
+        if self.job_in_progress:
+            self.after(50, self._poll_job_queue)
+    
+    def _check_cancelled(self):
+        """Stop the worker if Cancel was pressed"""
+        if self.cancel_event.is_set():
+            raise OperationCancelled("Operation cancelled")
+    
+    def _report_progress(self, done, total, text):
+        """Post progress from a worker; doubles as a cancellation point"""
+        self._check_cancelled()
+        percent = min(100, (done / total) * 100) if total else 100
+        self._post(self._show_progress, percent, f"{text} ({percent:.0f}%)")
+    
+    def _show_progress(self, percent, text):
+        """Update progress bar and status (Tk thread)"""
+        self.progress_var.set(int(percent))
+        self.update_status(text, "info")
+    
+    def _copy_with_progress(self, src_path, dst_path, text):
+        """Copy a file in blocks so long copies report progress and can be cancelled"""
+        total = os.path.getsize(src_path)
+        done = 0
+        with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+            while True:
+                block = src.read(8 * 1024 * 1024)
+                if not block:
+                    break
+                dst.write(block)
+                done += len(block)
+                self._report_progress(done, total, text)
+    
+    def _remove_partial(self, path):
+        """Remove a partially written output file"""
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
+    
+    def cancel_job(self):
+        """Ask the running worker to stop"""
+        if self.job_in_progress:
+            self.cancel_event.set()
+            self.update_status("Cancelling...", "warning")
+    
+    def _job_cancelled(self, message):
+        """Handle a cancelled job (Tk thread)"""
+        self._finish_job()
+        self.progress_var.set(0)
+        self.update_status(message, "warning")
+    
     # ===== MAIN FUNCTIONS =====
     
     def encode_message(self):
         """Encode (hide) message in audio"""
+        if self.job_in_progress:
+            return
+        
         try:
             # Get inputs
             source_file = self.source_entry.get()
@@ -1169,11 +1943,12 @@ Audio Information:
                 validation_errors.append("Encryption key is required.")
             
             # Check file extension
-            if source_file and not source_file.lower().endswith('.wav'):
+            if source_file and not source_file.lower().endswith(WAV_EXTENSIONS):
                 validation_errors.append("Source file must be a WAV audio.")
             
-            if output_file and not output_file.lower().endswith('.wav'):
-                output_file += '.wav'
+            # The output keeps the source's container, so its extension has to match
+            if output_file and self._output_path(output_file, source_file) != output_file:
+                output_file = self._output_path(output_file, source_file)
                 self.output_entry.delete(0, tk.END)
                 self.output_entry.insert(0, output_file)
             
@@ -1182,12 +1957,12 @@ Audio Information:
                 return
             
             # Check audio size for LSB
-            if method == "LSB":
-                capacity = self.calculate_lsb_capacity()
-                if len(secret_text) > capacity:
+            if method in ("LSB", "Spread", "Spectrum"):
+                capacity = self.calculate_lsb_capacity(method)
+                if len(secret_text.encode('utf-8')) > capacity:
                     messagebox.showwarning(
                         "Capacity Warning",
-                        f"Audio too short for message with LSB.\n\n"
+                        f"Audio too short for message with {method}.\n\n"
                         f"Audio capacity: {capacity} characters\n"
                         f"Message length: {len(secret_text)} characters\n\n"
                         f"Suggestions:\n"
@@ -1197,95 +1972,196 @@ Audio Information:
                     )
                     return
             
-            # Encode based on method
+            self.update_status(f"Starting {method} encoding...", "info")
+            self._start_job(self._encode_thread, source_file, output_file, secret_text, password, method)
+        
+        except Exception as e:
+            messagebox.showerror("Encoding Error", f"An error occurred:\n\n{str(e)}")
+            self.update_status("Encoding failed", "error")
+    
+    def _encode_thread(self, source_file, output_file, secret_text, password, method):
+        """Encoding worker - writes to a temp file so Cancel never leaves partial output"""
+        temp_file = output_file + ".part"
+        try:
+            # Encode based on method; each encoder returns the token it embedded
             if method == "LSB":
-                encoded_frames, params = self.lsb_encode(source_file, secret_text)
-                
-                # Save encoded audio
-                with wave.open(output_file, 'wb') as output_audio:
-                    output_audio.setparams(params)
-                    output_audio.writeframes(encoded_frames)
+                token = self.lsb_encode(source_file, secret_text, temp_file, password)
+            elif method == "Spread":
+                token = self.lsb_spread_encode(source_file, secret_text, temp_file, password)
+            elif method == "Phase":
+                token = self.phase_encode(source_file, secret_text, temp_file, password)
+            elif method == "Spectrum":
+                token = self.ss_encode(source_file, secret_text, temp_file, password)
             else:  # Chunk
-                encoded_data = self.chunk_encode(source_file, secret_text)
-                
-                # Save with chunk
-                with open(output_file, 'wb') as f:
-                    f.write(encoded_data)
-            
-            # Show success
-            audio_size = os.path.getsize(output_file) / 1024  # KB
-            messagebox.showinfo(
-                "Success",
-                f"✅ Message encoded successfully!\n\n"
-                f"• Method: {method}\n"
-                f"• Output: {os.path.basename(output_file)}\n"
-                f"• Size: {audio_size:.1f} KB\n"
-                f"• Message length: {len(secret_text)} characters\n\n"
-                f"⚠️ Remember your encryption key for extraction!"
-            )
-            
-            # Auto-fill encoded audio field
-            self.encoded_entry.delete(0, tk.END)
-            self.encoded_entry.insert(0, output_file)
-            self.encoded_entry.config(fg=self.COLORS['text'])
-            
-            # Auto-fill extract password
-            self.extract_password.delete(0, tk.END)
-            self.extract_password.insert(0, password)
-            
-            self.update_status(f"Message encoded with {method} method", "success")
+                token = self.chunk_encode(source_file, secret_text, temp_file, password)
             
+            os.replace(temp_file, output_file)
+            region = self._payload_frames(output_file, method, token)
+            self._post(self._encode_success, output_file, password, method, len(secret_text), region)
+        
+        except OperationCancelled:
+            self._remove_partial(temp_file)
+            self._post(self._job_cancelled, "Encoding cancelled")
         except ValueError as e:
-            messagebox.showerror("Capacity Error", str(e))
-            self.update_status("Encoding failed - capacity exceeded", "error")
+            self._remove_partial(temp_file)
+            self._post(self._encode_error, "Capacity Error", str(e), "Encoding failed - capacity exceeded")
         except Exception as e:
-            messagebox.showerror("Encoding Error", f"An error occurred:\n\n{str(e)}")
-            self.update_status("Encoding failed", "error")
+            self._remove_partial(temp_file)
+            self._post(self._encode_error, "Encoding Error", f"An error occurred:\n\n{str(e)}", "Encoding failed")
+    
+    def _encode_success(self, output_file, password, method, msg_length, region=None):
+        """Handle successful encoding"""
+        self._finish_job()
+        self.progress_var.set(100)
+        self.payload_regions[os.path.abspath(output_file)] = region
+        
+        # Show success
+        audio_size = os.path.getsize(output_file) / 1024  # KB
+        messagebox.showinfo(
+            "Success",
+            f"✅ Message encoded successfully!\n\n"
+            f"• Method: {method}\n"
+            f"• Output: {os.path.basename(output_file)}\n"
+            f"• Size: {audio_size:.1f} KB\n"
+            f"• Message length: {msg_length} characters\n\n"
+            f"⚠️ Remember your encryption key for extraction!"
+        )
+        
+        # Auto-fill encoded audio field
+        self.encoded_entry.delete(0, tk.END)
+        self.encoded_entry.insert(0, output_file)
+        self.encoded_entry.config(fg=self.COLORS['text'])
+        
+        # Auto-fill extract password
+        self.extract_password.delete(0, tk.END)
+        self.extract_password.insert(0, password)
+        
+        self.update_status(f"Message encoded with {method} method", "success")
+    
+    def _encode_error(self, title, error_msg, status):
+        """Handle encoding error"""
+        self._finish_job()
+        self.progress_var.set(0)
+        messagebox.showerror(title, error_msg)
+        self.update_status(status, "error")
     
     def decode_message(self):
         """Decode (extract) message from audio"""
-        try:
-            # Get inputs
-            encoded_file = self.encoded_entry.get()
-            password = self.extract_password.get()
-            
-            # Validate inputs
-            if not encoded_file or "Select encoded WAV audio" in encoded_file:
-                messagebox.showwarning("Input Error", "Please select an encoded WAV audio.")
-                return
-            
-            if not password:
-                messagebox.showwarning("Security Error", "Decryption key is required.")
-                return
+        if self.job_in_progress:
+            return
+        
+        # Get inputs
+        encoded_file = self.encoded_entry.get()
+        password = self.extract_password.get()
+        
+        # Validate inputs
+        if not encoded_file or "Select encoded WAV audio" in encoded_file:
+            messagebox.showwarning("Input Error", "Please select an encoded WAV audio.")
+            return
+        
+        if not password:
+            messagebox.showwarning("Security Error", "Decryption key is required.")
+            return
+        
+        # Check file extension
+        if not encoded_file.lower().endswith(WAV_EXTENSIONS + LOSSY_EXTENSIONS):
+            messagebox.showwarning("Invalid Format", "Only WAV files (or compressed spread-spectrum copies) are supported.")
+            return
+        
+        self.update_status("Starting decoding...", "info")
+        self._start_job(self._decode_thread, encoded_file, password)
+    
+    def _probe_carrier(self, audio_path, password):
+        """Chunk and LSB auto-detect through a single open handle.
+        
+        Parses the chunk table and returns the newest steg chunk that decrypts
+        with the password. Otherwise (no chunk, or a stale one from another key)
+        it reads the first 48 samples, and only a "gAAAAA" LSB signature leads
+        on to the full LSB read from the same handle. Clean files cost the
+        header plus a few hundred bytes.
+        """
+        with open(audio_path, 'rb') as f:
+            layout = self.get_audio_info(audio_path, f)
             
-            # Check file extension
-            if not encoded_file.lower().endswith('.wav'):
-                messagebox.showwarning("Invalid Format", "Only WAV files are supported.")
-                return
+            for chunk_id, offset, size in reversed(layout["chunks"]):
+                if chunk_id != b"steg":
+                    continue
+                f.seek(offset)
+                token = f.read(size).decode('utf-8', errors='replace')
+                try:
+                    self.decrypt_message(token, password)
+                except Exception:
+                    continue
+                return "Chunk", token
             
+            sampwidth = layout["sampwidth"]
+            if sampwidth in (1, 2):
+                f.seek(layout["data_offset"])
+                head = f.read(48 * sampwidth)
+                signature = np.packbits(np.frombuffer(head, dtype=np.uint8)[::sampwidth] & 1).tobytes()
+                if signature == b"gAAAAA":
+                    return "LSB", self._lsb_read_message(f, layout, head)
+        
+        return "Unknown", ""
+    
+    def _decode_thread(self, encoded_file, password):
+        """Decoding worker"""
+        try:
             extracted_encrypted = ""
             method_used = "Unknown"
             decoded_successfully = False
             
-            # Try Chunk method first
-            try:
-                extracted_encrypted = self.chunk_decode(encoded_file)
-                if extracted_encrypted:
-                    method_used = "Chunk"
-                    decoded_successfully = True
-            except Exception as e:
-                print(f"Chunk decode failed: {e}")
-                pass
+            # Compressed carriers can only hold a spread-spectrum payload
+            if not encoded_file.lower().endswith(WAV_EXTENSIONS):
+                extracted_encrypted = self.ss_decode(encoded_file, password)
+                method_used = "Spectrum"
+                decoded_successfully = True
+            
+            # Chunk and LSB share one handle: chunk table, then an LSB signature probe
+            if not decoded_successfully:
+                try:
+                    method_used, extracted_encrypted = self._probe_carrier(encoded_file, password)
+                    decoded_successfully = bool(extracted_encrypted)
+                except OperationCancelled:
+                    raise
+                except Exception as e:
+                    print(f"Chunk/LSB probe failed: {e}")
+                    pass
+            
+            # Keyed spread LSB only needs a few seeks
+            if not decoded_successfully:
+                self._check_cancelled()
+                try:
+                    extracted_encrypted = self.lsb_spread_decode(encoded_file, password)
+                    if extracted_encrypted:
+                        method_used = "Spread"
+                        decoded_successfully = True
+                except Exception as e:
+                    print(f"Spread decode failed: {e}")
+                    pass
+            
+            # Phase coding needs a few FFTs of the first segment
+            if not decoded_successfully:
+                self._check_cancelled()
+                try:
+                    extracted_encrypted = self.phase_decode(encoded_file)
+                    if extracted_encrypted:
+                        method_used = "Phase"
+                        decoded_successfully = True
+                except Exception as e:
+                    print(f"Phase decode failed: {e}")
+                    pass
             
-            # If chunk failed, try LSB method
+            # Spread spectrum only analyses the leading region
             if not decoded_successfully:
+                self._check_cancelled()
                 try:
-                    extracted_encrypted = self.lsb_decode(encoded_file)
+                    extracted_encrypted = self.ss_decode(encoded_file, password)
                     if extracted_encrypted:
-                        method_used = "LSB"
+                        method_used = "Spectrum"
                         decoded_successfully = True
                 except Exception as e:
-                    print(f"LSB decode failed: {e}")
+                    print(f"Spread spectrum decode failed: {e}")
                     pass
             
             if not decoded_successfully or not extracted_encrypted:
@@ -1293,42 +2169,298 @@ Audio Information:
             
             # Decrypt the message
             decrypted_text = self.decrypt_message(extracted_encrypted, password)
+            region = self._payload_frames(encoded_file, method_used, extracted_encrypted)
+            
+            self._post(self._decode_success, decrypted_text, method_used, encoded_file, region)
+        
+        except OperationCancelled:
+            self._post(self._job_cancelled, "Decoding cancelled")
+        except Exception as e:
+            self._post(self._decode_error, str(e))
+    
+    def _decode_success(self, decrypted_text, method_used, encoded_file=None, region=None):
+        """Handle successful decoding"""
+        self._finish_job()
+        self.progress_var.set(100)
+        if encoded_file:
+            self.payload_regions[os.path.abspath(encoded_file)] = region
+        
+        # Display result
+        self.result_text.config(state="normal")
+        self.result_text.delete("1.0", tk.END)
+        self.result_text.insert("1.0", decrypted_text)
+        self.result_text.config(state="disabled")
+        
+        # Update counter and method info
+        self.update_result_counter(method_used)
+        
+        # Update status
+        self.update_status(f"Message extracted ({len(decrypted_text)} chars) using {method_used}", "success")
+    
+    def _decode_error(self, error_msg):
+        """Handle decoding error"""
+        self._finish_job()
+        self.progress_var.set(0)
+        
+        # Display error in result area
+        self.result_text.config(state="normal")
+        self.result_text.delete("1.0", tk.END)
+        self.result_text.insert("1.0", f"Error: {error_msg}")
+        self.result_text.config(state="disabled")
+        
+        # Update counter
+        self.update_result_counter("Failed")
+        
+        # Show appropriate error message
+        if "password" in error_msg.lower() or "decrypt" in error_msg.lower():
+            messagebox.showerror("Decryption Error", "Incorrect decryption key!")
+        elif "capacity" in error_msg.lower():
+            messagebox.showerror("Capacity Error", error_msg)
+        elif "WAV" in error_msg:
+            messagebox.showerror("Format Error", "Please use WAV format only.")
+        else:
+            messagebox.showerror("Decoding Error", f"Failed to decode message:\n\n{error_msg}")
+        
+        self.update_status("Decoding failed", "error")
+    
+    
+    # ===== STEGANALYSIS =====
+    
+    def scan_folder(self):
+        """Rank every WAV under a folder by LSB steganalysis score"""
+        if self.job_in_progress:
+            return
+        
+        folder = filedialog.askdirectory(title="Select Folder of WAV Files to Scan")
+        if not folder:
+            return
+        
+        self.update_status(f"Scanning {os.path.basename(folder) or folder}...", "info")
+        self._start_job(self._scan_thread, folder)
+    
+    def _scan_thread(self, folder):
+        """Steganalysis worker - the statistics themselves run on a process pool"""
+        try:
+            reports = scan_directory(
+                folder, progress=lambda done, total: self._report_progress(done, total, "Scanning WAV files"))
+            self._post(self._scan_success, folder, reports)
+        except OperationCancelled:
+            self._post(self._job_cancelled, "Scan cancelled")
+        except Exception as e:
+            self._post(self._encode_error, "Scan Error", f"An error occurred:\n\n{str(e)}", "Scan failed")
+    
+    def _scan_success(self, folder, reports):
+        """Show the scan ranking in its own window"""
+        self._finish_job()
+        self.progress_var.set(100)
+        
+        flagged = sum(1 for r in reports if r["score"] > 0)
+        self.update_status(f"Scanned {len(reports)} files, {flagged} suspicious", "warning" if flagged else "success")
+        
+        report_window = tk.Toplevel(self)
+        report_window.title("Steganalysis Results")
+        report_window.geometry("900x450")
+        report_window.configure(bg=self.COLORS['bg'])
+        
+        tk.Label(
+            report_window,
+            text=f"Steganalysis: {folder}",
+            font=("Courier New", 14, "bold"),
+            fg=self.COLORS['primary'],
+            bg=self.COLORS['bg']
+        ).pack(pady=(10, 5))
+        
+        text_frame = tk.Frame(report_window, bg=self.COLORS['bg'])
+        text_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        
+        text_widget = tk.Text(
+            text_frame,
+            font=("Consolas", 10),
+            fg=self.COLORS['text'],
+            bg="#0f151f",
+            wrap="none"
+        )
+        text_widget.insert("1.0", format_scan_report(reports) if reports else "No WAV files found.")
+        text_widget.config(state="disabled")
+        
+        y_scrollbar = tk.Scrollbar(text_frame, command=text_widget.yview)
+        y_scrollbar.pack(side="right", fill="y")
+        text_widget.config(yscrollcommand=y_scrollbar.set)
+        
+        x_scrollbar = tk.Scrollbar(text_frame, orient="horizontal", command=text_widget.xview)
+        x_scrollbar.pack(side="bottom", fill="x")
+        text_widget.config(xscrollcommand=x_scrollbar.set)
+        
+        text_widget.pack(side="left", fill="both", expand=True)
+        
+        tk.Label(
+            report_window,
+            text=f"Score: 1 = steg chunk (C) or LSB signature (S), else the SPA rate of the block with the highest z, once z >= {SPA_MIN_Z:g}",
+            font=("Segoe UI", 9),
+            fg=self.COLORS['secondary'],
+            bg=self.COLORS['bg']
+        ).pack(pady=(5, 10))
+        
+        tk.Button(
+            report_window,
+            text="Close",
+            font=("Segoe UI", 10),
+            fg=self.COLORS['bg'],
+            bg=self.COLORS['accent'],
+            command=report_window.destroy
+        ).pack(pady=(0, 10))
+    
+    # ===== WAVEFORM OVERVIEW =====
+    
+    def _payload_frames(self, audio_path, method, token):
+        """Frame range (start, stop, method) a payload occupies, or None"""
+        try:
+            layout = self.get_audio_info(audio_path)
+        except Exception:
+            return None
+        
+        if method == "LSB":
+            samples = (len(token) + len("###END###")) * 8
+            stop = -(-samples // layout["channels"])
+        elif method == "Spread":
+            stop = layout["nframes"]
+        elif method == "Phase":
+            raw_length = len(base64.urlsafe_b64decode(token))
+            stop = self._phase_segment_length(16 + 8 * raw_length) + PHASE_FADE
+        elif method == "Spectrum":
+            raw_length = len(base64.urlsafe_b64decode(token))
+            stop = self._ss_region(len(SS_PREAMBLE) + SS_REPEAT * (16 + 8 * raw_length))[1]
+        else:  # Chunk lives outside the samples
+            return None
+        return (0, min(stop, layout["nframes"]), method)
+    
+    def show_waveform(self):
+        """Open the waveform overview of the encoded audio"""
+        if self.job_in_progress:
+            return
+        
+        audio_path = self.encoded_entry.get()
+        if not audio_path or not audio_path.lower().endswith(WAV_EXTENSIONS) or not os.path.exists(audio_path):
+            messagebox.showwarning("No Audio", "Please select an encoded WAV audio file first.")
+            return
+        
+        stat = os.stat(audio_path)
+        pyramid = self.waveform_cache.get((os.path.abspath(audio_path), stat.st_mtime_ns, stat.st_size))
+        if pyramid is not None:
+            self._open_waveform_window(audio_path, pyramid)
+            return
+        
+        self.update_status("Building waveform overview...", "info")
+        self._start_job(self._waveform_thread, audio_path)
+    
+    def _waveform_thread(self, audio_path):
+        """Build the min/max pyramid on the worker thread; the Tk thread caches it"""
+        try:
+            stat = os.stat(audio_path)
+            layout = self.get_audio_info(audio_path)
+            pyramid = build_waveform_pyramid(
+                audio_path, layout,
+                progress=lambda done, total: self._report_progress(done, total, "Building waveform"))
+            cache_key = (os.path.abspath(audio_path), stat.st_mtime_ns, stat.st_size)
+            self._post(self._waveform_ready, audio_path, pyramid, cache_key)
+        except OperationCancelled:
+            self._post(self._job_cancelled, "Waveform cancelled")
+        except Exception as e:
+            self._post(self._encode_error, "Waveform Error", f"Could not read audio:\n\n{str(e)}", "Waveform failed")
+    
+    def _waveform_ready(self, audio_path, pyramid, cache_key):
+        """Pyramid finished (Tk thread)"""
+        self.waveform_cache[cache_key] = pyramid
+        self._finish_job()
+        self.progress_var.set(100)
+        self.update_status("Waveform ready", "success")
+        self._open_waveform_window(audio_path, pyramid)
+    
+    def _open_waveform_window(self, audio_path, pyramid):
+        """Toplevel with the overview canvas; zoom and scroll only touch the pyramid"""
+        region = self.payload_regions.get(os.path.abspath(audio_path))
+        nframes = max(1, pyramid["nframes"])
+        view = {"start": 0, "span": nframes}
+        
+        window = tk.Toplevel(self)
+        window.title(f"Waveform - {os.path.basename(audio_path)}")
+        window.geometry("900x360")
+        window.configure(bg=self.COLORS['bg'])
+        
+        canvas = tk.Canvas(window, bg="#0f151f", highlightthickness=0, height=240)
+        canvas.pack(fill="both", expand=True, padx=10, pady=(10, 0))
+        
+        scrollbar = tk.Scrollbar(window, orient="horizontal")
+        scrollbar.pack(fill="x", padx=10)
+        
+        controls = tk.Frame(window, bg=self.COLORS['bg'])
+        controls.pack(fill="x", padx=10, pady=5)
+        
+        if region:
+            region_text = f"Payload ({region[2]}): {region[0] / pyramid['framerate']:.2f}s - {region[1] / pyramid['framerate']:.2f}s"
+        else:
+            region_text = "Payload region unknown (encode or decode this file first)"
+        info_label = tk.Label(controls, text=region_text, font=("Segoe UI", 9),
+                              fg=self.COLORS['secondary'], bg=self.COLORS['bg'])
+        info_label.pack(side="left")
+        
+        def redraw(event=None):
+            width = max(canvas.winfo_width(), 2)
+            height = max(canvas.winfo_height(), 2)
+            canvas.delete("all")
             
-            # Display result
-            self.result_text.config(state="normal")
-            self.result_text.delete("1.0", tk.END)
-            self.result_text.insert("1.0", decrypted_text)
-            self.result_text.config(state="disabled")
+            start, span = view["start"], view["span"]
+            mins, maxs = waveform_columns(pyramid, start, start + span, width)
             
-            # Update counter and method info
-            self.update_result_counter(method_used)
+            # Payload overlay first so the waveform stays on top
+            if region and region[1] > start and region[0] < start + span:
+                x0 = max(0, (region[0] - start) * width / span)
+                x1 = min(width, (region[1] - start) * width / span)
+                canvas.create_rectangle(x0, 0, max(x1, x0 + 1), height, fill=self.COLORS['accent'],
+                                        stipple="gray25", outline="")
             
-            # Update status
-            self.update_status(f"Message extracted ({len(decrypted_text)} chars) using {method_used}", "success")
+            scale = (height / 2 - 2) / pyramid["peak"]
+            step = width / max(1, len(mins))
+            for i in range(len(mins)):
+                x = i * step
+                canvas.create_line(x, height / 2 - maxs[i] * scale, x, height / 2 - mins[i] * scale + 1,
+                                   fill=self.COLORS['primary'], width=max(1, int(step)))
             
-        except Exception as e:
-            error_msg = str(e)
-            
-            # Display error in result area
-            self.result_text.config(state="normal")
-            self.result_text.delete("1.0", tk.END)
-            self.result_text.insert("1.0", f"Error: {error_msg}")
-            self.result_text.config(state="disabled")
-            
-            # Update counter
-            self.update_result_counter("Failed")
-            
-            # Show appropriate error message
-            if "password" in error_msg.lower() or "decrypt" in error_msg.lower():
-                messagebox.showerror("Decryption Error", "Incorrect decryption key!")
-            elif "capacity" in error_msg.lower():
-                messagebox.showerror("Capacity Error", error_msg)
-            elif "WAV" in error_msg:
-                messagebox.showerror("Format Error", "Please use WAV format only.")
+            scrollbar.set(start / nframes, (start + span) / nframes)
+        
+        def zoom(factor):
+            center = view["start"] + view["span"] / 2
+            min_span = min(nframes, pyramid["base"] * max(canvas.winfo_width(), 2))
+            view["span"] = int(min(nframes, max(min_span, view["span"] * factor)))
+            view["start"] = int(min(max(0, center - view["span"] / 2), nframes - view["span"]))
+            redraw()
+        
+        def scroll(action, amount, unit=None):
+            if action == "moveto":
+                start = float(amount) * nframes
             else:
-                messagebox.showerror("Decoding Error", f"Failed to decode message:\n\n{error_msg}")
-            
-            self.update_status("Decoding failed", "error")
+                step = view["span"] if unit == "pages" else view["span"] / 10
+                start = view["start"] + int(amount) * step
+            view["start"] = int(min(max(0, start), nframes - view["span"]))
+            redraw()
+        
+        scrollbar.config(command=scroll)
+        canvas.bind("<Configure>", redraw)
+        
+        for text, factor in (("➖ Zoom Out", 2), ("➕ Zoom In", 0.5)):
+            tk.Button(
+                controls,
+                text=text,
+                font=("Segoe UI", 9),
+                fg=self.COLORS['secondary'],
+                bg=self.COLORS['card_bg'],
+                activeforeground=self.COLORS['primary'],
+                activebackground="#2a3546",
+                borderwidth=1,
+                relief="raised",
+                cursor="hand2",
+                command=lambda f=factor: zoom(f)
+            ).pack(side="right", padx=(5, 0))
     
     # ===== UTILITY FUNCTIONS =====
     
@@ -1383,6 +2515,7 @@ Audio Information:
         self.result_method_label.config(text="Method: Unknown")
         
         self.encoded_audio_path = ""
+        self.progress_var.set(0)
         
         self.update_status("Extract section cleared", "info")
     
@@ -1425,4 +2558,376 @@ Audio Information:
         }
         
         color = colors.get(status_type, self.COLORS['secondary'])
-        self.status_label.config(text=message, fg=color)
\ No newline at end of file
+        self.status_label.config(text=message, fg=color)
+
+
+# ===== STREAMING PIPELINE =====
+
+def _read_exact(stream, size):
+    """Read exactly size bytes from a (possibly piped) binary stream"""
+    data = stream.read(size)
+    if len(data) < size:
+        raise ValueError("Unexpected end of WAV stream")
+    return data
+
+
+def _stream_wav_header(src, dst=None):
+    """Read a RIFF/RF64 or Wave64 stream up to the data payload, copying it to dst.
+    
+    Returns the format as (channels, sampwidth) and the data size, which is
+    None when the writer could not know it (0 or an all-ones size in a pipe).
+    """
+    riff = _read_exact(src, 12)
+    is_w64 = riff == W64_RIFF_GUID[:12]
+    if is_w64:
+        # Wave64: 16-byte GUID ids and 64-bit sizes that count the 24-byte chunk header
+        riff += _read_exact(src, 28)
+        if riff[12:16] != W64_RIFF_GUID[12:] or riff[24:40] != b"wave" + W64_CHUNK_SUFFIX:
+            raise ValueError("Not a RIFF/RF64/Wave64 WAVE stream")
+        unknown_sizes = (0, 0x7FFFFFFFFFFFFFFF - 24, 0xFFFFFFFFFFFFFFFF - 24)
+    elif riff[:4] not in (b"RIFF", b"RF64", b"BW64") or riff[8:12] != b"WAVE":
+        raise ValueError("Not a RIFF/RF64/Wave64 WAVE stream")
+    else:
+        unknown_sizes = (0, 0xFFFFFFFF)
+    
+    header = [riff]
+    fmt = None
+    ds64_data_size = None
+    while True:
+        if is_w64:
+            chunk_header = _read_exact(src, 24)
+            guid, chunk_size = struct.unpack("<16sQ", chunk_header)
+            chunk_id = guid[:4] if guid[4:] == W64_CHUNK_SUFFIX else guid
+            chunk_size = max(chunk_size - 24, 0)
+            padding = -chunk_size % 8
+        else:
+            chunk_header = _read_exact(src, 8)
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            padding = chunk_size % 2
+        header.append(chunk_header)
+        if chunk_id == b"data":
+            break
+        
+        body = _read_exact(src, chunk_size + padding)
+        header.append(body)
+        if chunk_id == b"fmt ":
+            _, channels, _, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+            fmt = (channels, (bits + 7) // 8)
+        elif chunk_id == b"ds64":
+            ds64_data_size = struct.unpack("<Q", body[8:16])[0]
+    
+    if fmt is None:
+        raise ValueError("WAV stream has no fmt chunk before its data")
+    
+    if dst is not None:
+        dst.write(b"".join(header))
+        dst.flush()
+    
+    if chunk_size == 0xFFFFFFFF and ds64_data_size:
+        return fmt, ds64_data_size
+    return fmt, (chunk_size if chunk_size not in unknown_sizes else None)
+
+
+def stream_lsb_encode(src, dst, message, password, block_frames=STREAM_BLOCK_FRAMES):
+    """Hide a message in the LSBs of the first samples of a WAV stream.
+    
+    Blocks are patched and written to dst as they arrive, so memory stays at
+    one block however long the stream is. The output reads back with the
+    regular LSB decoder. Returns the number of samples carrying the payload.
+    """
+    (channels, sampwidth), data_size = _stream_wav_header(src, dst)
+    if sampwidth not in (1, 2):
+        raise ValueError(f"Unsupported sample width: {sampwidth}")
+    
+    payload = encrypt_message(message, password) + "###END###"
+    bits = np.unpackbits(np.frombuffer(payload.encode('utf-8'), dtype=np.uint8))
+    if data_size is not None and len(bits) > data_size // sampwidth:
+        raise ValueError(f"Message too long! Capacity: {data_size // sampwidth // 8} chars, Needed: {len(bits) // 8} chars")
+    
+    block_bytes = block_frames * channels * sampwidth
+    remaining = data_size
+    done = 0
+    while remaining is None or remaining > 0:
+        raw = src.read(block_bytes if remaining is None else min(block_bytes, remaining))
+        if not raw:
+            break
+        if remaining is not None:
+            remaining -= len(raw)
+        
+        if done < len(bits):
+            block = np.frombuffer(raw, dtype=np.uint8).copy()
+            low_bytes = block[::sampwidth]
+            count = min(len(low_bytes), len(bits) - done)
+            low_bytes[:count] = (low_bytes[:count] & 0xFE) | bits[done:done + count]
+            done += count
+            raw = block.tobytes()
+        
+        dst.write(raw)
+        dst.flush()
+    
+    # Chunks after the data payload pass through untouched
+    while True:
+        raw = src.read(block_bytes)
+        if not raw:
+            break
+        dst.write(raw)
+    dst.flush()
+    
+    if done < len(bits):
+        raise ValueError("Stream ended before the whole message was embedded")
+    return done
+
+
+def stream_lsb_decode(src, password, block_frames=STREAM_BLOCK_FRAMES):
+    """Read an LSB message from a WAV stream, stopping at the end marker"""
+    (channels, sampwidth), data_size = _stream_wav_header(src)
+    if sampwidth not in (1, 2):
+        raise ValueError(f"Unsupported sample width: {sampwidth}")
+    
+    # Whole message bytes per block, so blocks pack independently
+    samples_per_block = -(-block_frames * channels // 8) * 8
+    block_bytes = samples_per_block * sampwidth
+    marker = b"###END###"
+    message = bytearray()
+    remaining = data_size
+    
+    while remaining is None or remaining > 0:
+        raw = src.read(block_bytes if remaining is None else min(block_bytes, remaining))
+        if not raw:
+            break
+        if remaining is not None:
+            remaining -= len(raw)
+        
+        lsb_bits = np.frombuffer(raw, dtype=np.uint8)[::sampwidth] & 1
+        search_from = max(0, len(message) - len(marker) + 1)
+        message += np.packbits(lsb_bits[:len(lsb_bits) - len(lsb_bits) % 8]).tobytes()
+        
+        index = message.find(marker, search_from)
+        if index != -1:
+            return decrypt_message(message[:index].decode('utf-8'), password)
+        
+        # Fernet tokens always start this way; don't read a clean stream to the end
+        if len(message) >= 6 and not message.startswith(b"gAAAAA"):
+            break
+    
+    raise Exception("No LSB marker found in stream")
+
+
+# ===== STEGANALYSIS =====
+
+# Coefficients (1, q, q^2) that the counts of trace set C_m (columns: LSBs of the
+# pair 00, 01, 10, 11) and of C_m+1 take in the equation for E_2m+1 = O_2m+1
+SPA_ROW_WEIGHTS = np.array([[0, -1, 1], [1, -2, 1], [0, 0, 1], [0, -1, 1]], dtype=np.float64)
+SPA_NEXT_ROW_WEIGHTS = np.array([[0, 1, -1], [0, 0, -1], [-1, 2, -1], [0, 1, -1]], dtype=np.float64)
+
+
+def sample_pair_counts(samples, trace_sets=SPA_TRACE_SETS):
+    """Trace-set counts of adjacent sample pairs for sample pair analysis.
+    
+    Row m + trace_sets + 1 counts the pairs (u, v) with v//2 - u//2 = m, for
+    |m| <= trace_sets + 1, split by the LSBs of (u, v) into columns 00, 01,
+    10 and 11. LSB embedding only moves pairs between the columns of a row.
+    """
+    u = samples[:-1]
+    v = samples[1:]
+    m = (v >> 1) - (u >> 1)
+    keep = np.abs(m) <= trace_sets + 1
+    cells = (m[keep] + trace_sets + 1) * 4 + (u[keep] & 1) * 2 + (v[keep] & 1)
+    return np.bincount(cells, minlength=(2 * trace_sets + 3) * 4).reshape(-1, 4)
+
+
+def sample_pair_rate(counts):
+    """Embedding rate and its z-score from trace-set counts (SPA, Ker's form).
+    
+    In a cover, pairs with odd difference 2m+1 start on an even sample as
+    often as on an odd one. Flipping LSBs with probability q turns that into a
+    quadratic in q per trace set; the equations for m >= 0 and the mirrored
+    ones for m < 0 are summed, and the root nearest zero gives the rate 2q.
+    
+    The z-score is the same sum at q = 0 over its Poisson noise. Clean covers
+    stay near 0, and so do loud ones whose LSBs are already random, embedded
+    or not - the rate is only meaningful when z is large.
+    """
+    trace_sets = (len(counts) - 3) // 2
+    weights = np.zeros(counts.shape + (3,))
+    for m in range(-trace_sets - 1, trace_sets + 1):
+        sign = 1 if m >= 0 else -1
+        weights[m + trace_sets + 1] += sign * SPA_ROW_WEIGHTS
+        weights[m + trace_sets + 2] += sign * SPA_NEXT_ROW_WEIGHTS
+    
+    counts = counts.astype(np.float64)
+    c, b, a = np.einsum('rl,rlk->k', counts, weights)
+    variance = np.sum(weights[..., 0] ** 2 * counts)
+    z = float(c / np.sqrt(variance)) if variance else 0.0
+    
+    if a == 0:
+        return (float(-2 * c / b) if b else 0.0), z
+    root = np.sqrt(max(b * b - 4 * a * c, 0))
+    q = min((-b + root) / (2 * a), (-b - root) / (2 * a), key=abs)
+    return float(2 * q), z
+
+
+def scan_wav_file(audio_path):
+    """Steganalysis report for one WAV file (top level so process pools can pickle it).
+    
+    The data is read once, in blocks of SCAN_BLOCK_SAMPLES frames. Every block
+    gets a sample pair rate and z-score pooled over the channels, and the block
+    with the highest z is reported. The score is 1 for a steg chunk or an LSB
+    Fernet signature, otherwise that block's rate once z reaches SPA_MIN_Z.
+    """
+    report = {"path": audio_path, "score": 0.0, "rate": 0.0, "z": 0.0, "block": 0,
+              "steg_chunk": False, "lsb_signature": False, "error": None}
+    try:
+        layout = read_wav_layout(audio_path)
+        report["steg_chunk"] = any(c[0] == b"steg" for c in layout["chunks"])
+        
+        dtypes = {1: np.uint8, 2: np.dtype('<i2')}
+        if layout["sampwidth"] not in dtypes:
+            raise ValueError(f"Unsupported sample width: {layout['sampwidth']}")
+        
+        channels = layout["channels"]
+        frames = layout["data_size"] // (channels * layout["sampwidth"])
+        samples = np.memmap(audio_path, dtype=dtypes[layout["sampwidth"]], mode='r',
+                            offset=layout["data_offset"], shape=(frames, channels))
+        
+        # The repo's own LSB layout starts with a Fernet token ("gAAAAA")
+        head = np.asarray(samples.reshape(-1)[:48]).view(np.uint8)[::layout["sampwidth"]] & 1
+        report["lsb_signature"] = np.packbits(head).tobytes() == b"gAAAAA"
+        
+        for index, start in enumerate(range(0, frames, SCAN_BLOCK_SAMPLES)):
+            block = samples[start:start + SCAN_BLOCK_SAMPLES].astype(np.int32)
+            
+            counts = np.sum([sample_pair_counts(block[:, ch]) for ch in range(channels)], axis=0)
+            rate, z = sample_pair_rate(counts)
+            if z > report["z"]:
+                report.update(rate=min(max(rate, 0.0), 1.0), z=z, block=index)
+        del samples
+        
+        if report["steg_chunk"] or report["lsb_signature"]:
+            report["score"] = 1.0
+        elif report["z"] >= SPA_MIN_Z:
+            # Below that the rate is noise, not evidence
+            report["score"] = report["rate"]
+    
+    except Exception as e:
+        report["error"] = str(e)
+    
+    return report
+
+
+def scan_directory(root, workers=None, progress=None):
+    """Scan every WAV under root on a process pool, most suspicious first.
+    
+    progress(done, total) is called as files finish; an exception raised from
+    it cancels the files that have not started yet.
+    """
+    paths = sorted(
+        os.path.join(folder, name)
+        for folder, _, names in os.walk(root)
+        for name in names
+        if name.lower().endswith(WAV_EXTENSIONS)
+    )
+    reports = []
+    if not paths:
+        return reports
+    
+    # The GUI calls this from a job thread, so never fork: workers start fresh
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+    try:
+        futures = [executor.submit(scan_wav_file, path) for path in paths]
+        for future in as_completed(futures):
+            reports.append(future.result())
+            if progress:
+                progress(len(reports), len(paths))
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+    
+    reports.sort(key=lambda r: (r["score"], r["z"]), reverse=True)
+    return reports
+
+
+def format_scan_report(reports):
+    """Plain-text ranking table for scan_directory results"""
+    lines = [f"{'Score':>6}  {'SPA':>5}  {'z':>6}  {'Block':>5}  Flags  File"]
+    for r in reports:
+        if r["error"]:
+            lines.append(f"{'-':>6}  {'-':>5}  {'-':>6}  {'-':>5}  {'ERR':<5}  {r['path']} ({r['error']})")
+            continue
+        flags = ("C" if r["steg_chunk"] else "-") + ("S" if r["lsb_signature"] else "-")
+        # An insignificant block's rate is noise; don't print it next to the score
+        rate = f"{r['rate']:5.2f}" if r["z"] >= SPA_MIN_Z else f"{'-':>5}"
+        lines.append(f"{r['score']:6.3f}  {rate}  {r['z']:6.1f}  {r['block']:5d}  {flags:<5}  {r['path']}")
+    return "\n".join(lines)
+
+
+# ===== WAVEFORM PYRAMID =====
+
+def build_waveform_pyramid(audio_path, layout, block_frames=1 << 20, progress=None):
+    """Min/max decimation pyramid of a WAV, built in one streaming pass.
+    
+    Level 0 keeps the min and max of every WAVEFORM_BASE frames (over all
+    channels); each further level halves the previous one, down to about
+    WAVEFORM_MIN_BUCKETS buckets. Nothing is reread when the view zooms.
+    """
+    dtypes = {1: np.uint8, 2: np.dtype('<i2')}
+    if layout["sampwidth"] not in dtypes:
+        raise ValueError(f"Unsupported sample width: {layout['sampwidth']}")
+    
+    channels = layout["channels"]
+    frames = layout["data_size"] // (channels * layout["sampwidth"])
+    samples = np.memmap(audio_path, dtype=dtypes[layout["sampwidth"]], mode='r',
+                        offset=layout["data_offset"], shape=(frames, channels))
+    dc = 128 if layout["sampwidth"] == 1 else 0
+    block_frames -= block_frames % WAVEFORM_BASE
+    
+    mins = np.empty(-(-frames // WAVEFORM_BASE), dtype=np.int16)
+    maxs = np.empty_like(mins)
+    for start in range(0, frames, block_frames):
+        # One bucket is WAVEFORM_BASE interleaved frames; the file's last bucket
+        # may be short, so pad it with its own edge value
+        block = np.asarray(samples[start:start + block_frames]).reshape(-1)
+        pad = -len(block) % (WAVEFORM_BASE * channels)
+        buckets = np.pad(block, (0, pad), mode='edge').reshape(-1, WAVEFORM_BASE * channels)
+        
+        first = start // WAVEFORM_BASE
+        mins[first:first + len(buckets)] = buckets.min(axis=1).astype(np.int16) - dc
+        maxs[first:first + len(buckets)] = buckets.max(axis=1).astype(np.int16) - dc
+        if progress:
+            progress(min(start + block_frames, frames), frames)
+    del samples
+    
+    levels = [(mins, maxs)]
+    while len(levels[-1][0]) > WAVEFORM_MIN_BUCKETS:
+        low, high = levels[-1]
+        if len(low) % 2:
+            low, high = np.append(low, low[-1]), np.append(high, high[-1])
+        levels.append((low.reshape(-1, 2).min(axis=1), high.reshape(-1, 2).max(axis=1)))
+    
+    # Widen first: abs(-32768) does not fit in int16
+    peak = max(1, int(np.abs(mins.astype(np.int32)).max(initial=0)),
+               int(np.abs(maxs.astype(np.int32)).max(initial=0)))
+    return {"base": WAVEFORM_BASE, "levels": levels, "nframes": frames,
+            "framerate": layout["framerate"], "peak": peak}
+
+
+def waveform_columns(pyramid, start, stop, width):
+    """Min/max per pixel column for frames [start, stop) from the best pyramid level"""
+    span = max(1, stop - start)
+    
+    # Coarsest level that still has at least one bucket per column
+    level = 0
+    while (level + 1 < len(pyramid["levels"])
+           and span / (pyramid["base"] << (level + 1)) >= width):
+        level += 1
+    
+    mins, maxs = pyramid["levels"][level]
+    bucket = pyramid["base"] << level
+    first, last = start // bucket, min(len(mins), -(-stop // bucket))
+    if last <= first:
+        return np.zeros(0, dtype=np.int16), np.zeros(0, dtype=np.int16)
+    
+    columns = min(width, last - first)
+    edges = first + (np.arange(columns) * (last - first)) // columns
+    return np.minimum.reduceat(mins[first:last], edges - first), np.maximum.reduceat(maxs[first:last], edges - first)
\ No newline at end of file
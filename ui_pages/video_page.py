@@ -11,8 +11,557 @@ import numpy as np
 import time
 import threading
 import subprocess
+import math
+import atexit
+import queue
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
 from PIL import Image, ImageTk
 
+# Output codecs for LSB video: ffmpeg video arguments and the containers that can hold them.
+# The lossless codecs are fed raw BGR frames over a pipe so every LSB survives; mp4v is the
+# original lossy OpenCV writer and is kept for compatibility.
+VIDEO_CODECS = {
+    "x264 lossless": {"args": ['-c:v', 'libx264rgb', '-qp', '0'], "extensions": ('.mp4', '.mkv'), "codec_id": 'h264'},
+    "FFV1": {"args": ['-c:v', 'ffv1', '-level', '3', '-g', '1'], "extensions": ('.mkv', '.avi'), "codec_id": 'ffv1'},
+    "mp4v (lossy)": {"args": None, "extensions": None, "codec_id": None},
+}
+# x264 speed/size tradeoff; FFV1 has no presets
+X264_PRESETS = ("ultrafast", "superfast", "veryfast", "faster", "fast", "medium", "slow", "slower", "veryslow")
+# EOF payloads end with a fixed trailer: message length and marker. Files written before
+# the trailer existed are found by scanning back at most EOF_LEGACY_SCAN bytes.
+EOF_MARKER = b'EOFSTEGO'
+EOF_TRAILER = struct.Struct('<I8s')
+EOF_LEGACY_SCAN = 1 << 20
+EOF_SCAN_CHUNK = 64 << 10
+# LSB payloads start with a magic + message length header in the first frame, so
+# decoding stops after exactly the frames the payload spans. Older payloads are the
+# bare Fernet token ended by ###END###; those stop at the first non-token byte.
+LSB_MAGIC = b'LSBSTEGO'
+LSB_HEADER = struct.Struct('<8sI')
+# Spread payloads use every stride-th frame from frame 0; the header also records the stride
+LSB_SPREAD_MAGIC = b'LSBSPRED'
+LSB_SPREAD_HEADER = struct.Struct('<8sII')
+# Payload frames further apart than this are made keyframes and each read by a keyframe
+# seek; shorter gaps are cheaper to grab() through than to start a decoder
+LSB_SEEK_MIN_GAP = 16
+LSB_TOKEN_CHARS = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_='
+
+# Frames buffered between the read, embed and write stages (bounds memory for 4K input)
+PIPELINE_DEPTH = 4
+# Payload frames needed before embedding moves to a process pool, and shared-memory
+# frame slots per pool worker
+EMBED_POOL_MIN_FRAMES = 8
+EMBED_SLOTS_PER_WORKER = 2
+
+# Shared-memory blocks a pool worker has attached, by name
+_attached_blocks = {}
+
+
+def _attach_blocks(names):
+    """Process-pool initializer: attach the frame slots and message bits once per worker"""
+    for name in names:
+        _attached_blocks[name] = shared_memory.SharedMemory(name=name)
+    atexit.register(_detach_blocks)
+
+
+def _detach_blocks():
+    """Close the worker's handles when the pool shuts it down"""
+    for block in _attached_blocks.values():
+        block.close()
+    _attached_blocks.clear()
+
+
+def _payload_bits(payload, start_index, count):
+    """count payload bits from bit start_index on, one per byte (payload stays packed until here)"""
+    offset = start_index % 8
+    return np.unpackbits(payload[start_index // 8:(start_index + count + 7) // 8])[offset:offset + count]
+
+
+def _embed_frame_in_slot(slot_name, frame_bytes, payload_name, payload_size, start_index):
+    """Process-pool worker: set the LSBs of the frame in shared-memory slot slot_name in place"""
+    flat = np.ndarray(frame_bytes, dtype=np.uint8, buffer=_attached_blocks[slot_name].buf)
+    payload = np.ndarray(payload_size, dtype=np.uint8, buffer=_attached_blocks[payload_name].buf)
+    count = min(frame_bytes, payload_size * 8 - start_index)
+    flat[:count] &= 0xFE
+    flat[:count] |= _payload_bits(payload, start_index, count)
+
+
+class SharedFrameEmbedder:
+    """Embeds payload frames on a process pool through a ring of shared-memory frame slots.
+    
+    The reader decodes straight into a free slot, a worker sets its LSBs in place and the
+    writer pipes the slot to the encoder before handing it back, so the dispatching thread
+    never copies or pickles a frame.
+    """
+    
+    def __init__(self, payload, shape, workers):
+        self.frame_bytes = int(np.prod(shape))
+        self.payload_size = payload.size
+        self.payload = shared_memory.SharedMemory(create=True, size=max(1, payload.size))
+        np.ndarray(payload.size, dtype=np.uint8, buffer=self.payload.buf)[:] = payload
+        # Slots being embedded, plus the ones queued ahead of and behind the embed stage
+        self.slots = [
+            shared_memory.SharedMemory(create=True, size=self.frame_bytes)
+            for _ in range(workers * EMBED_SLOTS_PER_WORKER + 2 * PIPELINE_DEPTH)
+        ]
+        self.frames = [np.ndarray(shape, dtype=np.uint8, buffer=slot.buf) for slot in self.slots]
+        self.free = queue.Queue()
+        for index in range(len(self.slots)):
+            self.free.put(index)
+        # Spawned rather than forked: the Tk process has threads running
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=get_context("spawn"), initializer=_attach_blocks,
+            initargs=([slot.name for slot in self.slots] + [self.payload.name],)
+        )
+    
+    def acquire(self, timeout):
+        """Index of a free slot, or None if none came free within timeout seconds"""
+        try:
+            return self.free.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def release(self, index):
+        self.free.put(index)
+    
+    def embed(self, index, start_index):
+        """Start embedding the bits from start_index into slot index; returns its future"""
+        return self.executor.submit(
+            _embed_frame_in_slot, self.slots[index].name, self.frame_bytes,
+            self.payload.name, self.payload_size, start_index
+        )
+    
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.frames = []
+        for block in self.slots + [self.payload]:
+            block.close()
+            block.unlink()
+
+
+class FFmpegFrameReader:
+    """cv2.VideoCapture look-alike that reads raw BGR frames from an ffmpeg decoder.
+    
+    With start (seconds), reading begins at the last keyframe at or before that time.
+    With frame_times (seconds, each inside a keyframe), only those keyframes are read,
+    in one ffmpeg run over a concat list of one-frame segments.
+    """
+    
+    def __init__(self, video_path, size, start=None, frame_times=None):
+        width, height = size
+        self.shape = (height, width, 3)
+        self.frame_bytes = width * height * 3
+        listing = None
+        if frame_times is not None:
+            # Each segment seeks to its keyframe and ends before the next packet
+            entry = "file 'file:" + os.path.abspath(video_path).replace("'", "'\\''") + "'\n"
+            listing = ''.join(f"{entry}inpoint {t:.6f}\noutpoint {t:.6f}\n" for t in frame_times)
+            source = ['-protocol_whitelist', 'file,pipe,fd', '-f', 'concat', '-safe', '0',
+                      '-skip_frame', 'nokey', '-i', '-']
+        elif start is not None:
+            source = ['-noaccurate_seek', '-ss', f'{start:.6f}', '-i', video_path]
+        else:
+            source = ['-i', video_path]
+        try:
+            self.proc = subprocess.Popen(
+                ['ffmpeg', '-v', 'error', *source, '-map', '0:v:0', '-vsync', 'passthrough',
+                 '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-'],
+                stdin=subprocess.PIPE if listing is not None else None,
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        except FileNotFoundError:
+            raise Exception("ffmpeg is required for lossless video output")
+        if listing is not None:
+            # ffmpeg reads the whole list before it decodes anything
+            try:
+                self.proc.stdin.write(listing.encode('utf-8'))
+                self.proc.stdin.close()
+            except BrokenPipeError:
+                pass
+    
+    def read(self):
+        data = self.proc.stdout.read(self.frame_bytes)
+        if len(data) < self.frame_bytes:
+            return False, None
+        return True, np.frombuffer(data, dtype=np.uint8).reshape(self.shape)
+    
+    def readinto(self, frame):
+        """Decode the next frame into the preallocated array frame; False at the end"""
+        view = memoryview(frame).cast('B')
+        filled = 0
+        while filled < self.frame_bytes:
+            count = self.proc.stdout.readinto(view[filled:])
+            if not count:
+                return False
+            filled += count
+        return True
+    
+    def release(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+        self.proc.stdout.close()
+
+
+class FFmpegFrameWriter:
+    """cv2.VideoWriter look-alike that pipes raw BGR frames into an ffmpeg encoder.
+    
+    With audio_source, that file's audio streams are copied into the output in the same pass.
+    """
+    
+    def __init__(self, output_path, fps, size, codec_args, preset=None, threads=0, sar=None, audio_source=None):
+        width, height = size
+        cmd = [
+            'ffmpeg', '-y', '-v', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{width}x{height}', '-r', str(fps), '-i', '-'
+        ]
+        if audio_source:
+            cmd += ['-i', audio_source, '-map', '0:v', '-map', '1:a?', '-c:a', 'copy']
+        cmd += codec_args
+        if sar and not sar.startswith('0/'):
+            cmd += ['-vf', f'setsar={sar}']
+        if preset:
+            cmd += ['-preset', preset]
+        cmd += ['-threads', str(threads), output_path]
+        try:
+            self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            raise Exception("ffmpeg is required for lossless video output")
+    
+    def write(self, frame):
+        try:
+            self.proc.stdin.write(np.ascontiguousarray(frame).data)
+        except BrokenPipeError:
+            self.release()
+    
+    def release(self):
+        if self.proc.stdin.closed:
+            return
+        self.proc.stdin.close()
+        error = self.proc.stderr.read().decode('utf-8', 'replace').strip()
+        if self.proc.wait() != 0:
+            raise Exception(f"ffmpeg encoder failed: {error or self.proc.returncode}")
+    
+    def abort(self):
+        """Kill the encoder without finishing the file (error paths)"""
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+        try:
+            self.proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        self.proc.stderr.close()
+
+
+# ===== STREAM COPY HELPERS (payload GOPs are re-encoded, the rest is copied) =====
+
+def _framecrc(video_path):
+    """Start ffmpeg listing the first video stream's packets; nothing is decoded"""
+    try:
+        return subprocess.Popen(
+            ['ffmpeg', '-v', 'error', '-i', video_path, '-map', '0:v:0', '-c', 'copy', '-f', 'framecrc', '-'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+    except FileNotFoundError:
+        raise Exception("ffmpeg is required to stream-copy video")
+
+
+def _framecrc_packets(proc, header):
+    """Yield (pts, duration, keyframe) per packet, filling header with the '#key: value' lines"""
+    for line in proc.stdout:
+        if line.startswith('#'):
+            key, _, value = line[1:].partition(':')
+            header[key.strip()] = value.strip()
+            continue
+        fields = [field.strip() for field in line.split(',')]
+        if len(fields) < 6:
+            continue
+        flags = next((int(f[2:], 16) for f in fields[6:] if f.startswith('F=')), 1)
+        yield int(fields[2]), int(fields[3]), bool(flags & 1)
+
+
+def _stream_signature(header):
+    """Codec, size, extradata and time base: streams must agree on these to be concatenated by copy"""
+    return tuple(header.get(key) for key in ('codec_id 0', 'dimensions 0', 'extradata 0', 'tb 0'))
+
+
+def probe_keyframe_cut(video_path, min_frames):
+    """Find the first keyframe at or after min_frames that no earlier packet displays past.
+    
+    Returns the number of frames before it, its time, the stream's frame rate, aspect
+    ratio and signature, or None if the video has no such keyframe.
+    """
+    proc = _framecrc(video_path)
+    header = {}
+    max_pts = None
+    try:
+        for index, (pts, duration, keyframe) in enumerate(_framecrc_packets(proc, header)):
+            if keyframe and index >= min_frames and (max_pts is None or max_pts < pts):
+                num, den = (int(x) for x in header['tb 0'].split('/'))
+                return {
+                    'frames': index,
+                    'inpoint': pts * num / den,
+                    'rate': f"{den}/{num * duration}" if duration > 0 else None,
+                    'sar': header.get('sar 0'),
+                    'signature': _stream_signature(header),
+                }
+            max_pts = pts if max_pts is None else max(max_pts, pts)
+        return None
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def payload_keyframe_times(video_path, stride, count):
+    """Seek times of frames 0, stride, 2 * stride, ... (count of them), from the packet list.
+    
+    Each time falls inside its frame, so a keyframe seek (FFmpegFrameReader start or
+    frame_times) lands on exactly that frame. Returns None unless all count frames exist and are keyframes.
+    """
+    proc = _framecrc(video_path)
+    header = {}
+    times = []
+    try:
+        for index, (pts, duration, keyframe) in enumerate(_framecrc_packets(proc, header)):
+            if index % stride:
+                continue
+            if not keyframe:
+                return None
+            num, den = (int(x) for x in header['tb 0'].split('/'))
+            times.append((pts + duration / 2) * num / den)
+            if len(times) == count:
+                return times
+        return None
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def video_stream_signature(video_path):
+    """Signature of a file's first video stream (see _stream_signature)"""
+    proc = _framecrc(video_path)
+    header = {}
+    try:
+        next(_framecrc_packets(proc, header), None)
+        return _stream_signature(header)
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def concat_stream_copy(head_path, video_path, inpoint, output_path):
+    """Write head_path followed by video_path from inpoint, plus video_path's audio, all by copy"""
+    list_path = output_path + '_concat.txt'
+    try:
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for path in (head_path, video_path):
+                f.write("file '" + os.path.abspath(path).replace("'", "'\\''") + "'\n")
+            # Round up so the seek cannot land on the keyframe before the cut
+            f.write(f"inpoint {math.ceil(inpoint * 1e6) / 1e6:.6f}\n")
+        
+        result = subprocess.run([
+            'ffmpeg', '-y', '-v', 'error', '-f', 'concat', '-safe', '0', '-i', list_path, '-i', video_path,
+            '-map', '0:v:0', '-map', '1:a?', '-c', 'copy', output_path
+        ], capture_output=True)
+        if result.returncode != 0:
+            raise Exception(f"ffmpeg stream copy failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+    finally:
+        if os.path.exists(list_path):
+            os.remove(list_path)
+
+
+# ===== FILE COPY HELPERS (constant memory, in-kernel where the OS allows) =====
+
+# Bytes per copy call; the read/write fallback uses COPY_CHUNK-sized buffers
+COPY_CALL_MAX = 1 << 30
+COPY_CHUNK = 1 << 20
+
+
+def write_all(fd, data):
+    """os.write until every byte of data is written"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def copy_bytes(src_fd, dst_fd, count):
+    """Copy count bytes between file descriptors, starting at their current offsets.
+    
+    Tries copy_file_range (no user-space copy, reflinks on supporting filesystems),
+    then sendfile, then a chunked read/write loop; both offsets advance by count.
+    """
+    kernel_copies = []
+    if hasattr(os, 'copy_file_range'):
+        kernel_copies.append(lambda size: os.copy_file_range(src_fd, dst_fd, size))
+    if hasattr(os, 'sendfile'):
+        kernel_copies.append(lambda size: os.sendfile(dst_fd, src_fd, None, size))
+    
+    remaining = count
+    for kernel_copy in kernel_copies:
+        try:
+            while remaining:
+                copied = kernel_copy(min(remaining, COPY_CALL_MAX))
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            # Not supported for these files (e.g. cross-device, or sendfile to a regular file)
+            continue
+    
+    while remaining:
+        chunk = os.read(src_fd, min(remaining, COPY_CHUNK))
+        if not chunk:
+            break
+        write_all(dst_fd, chunk)
+        remaining -= len(chunk)
+    
+    if remaining:
+        raise EOFError(f"Source ended {remaining} bytes early")
+
+
+# ===== MP4/MOV BOX HELPERS (metadata lives in moov/udta, media data is copied) =====
+
+# Extended type of the uuid box that carries the metadata block
+STEGO_UUID = bytes.fromhex('7a1c5e0b9d3f4b28a6e2c41f08d35b97')
+# Top-level box types a file may start with to be treated as ISO BMFF / QuickTime
+MP4_FIRST_BOXES = (b'ftyp', b'moov', b'mdat', b'free', b'skip', b'wide', b'pnot')
+# Boxes on the way from moov down to the chunk offset tables
+MP4_OFFSET_CONTAINERS = (b'trak', b'mdia', b'minf', b'stbl')
+
+
+def _box_header(header, available):
+    """(type, size, header_size) from the first 16 bytes of a box, or None if they are not one"""
+    if len(header) < 8:
+        return None
+    size, box_type = struct.unpack('>I4s', header[:8])
+    header_size = 8
+    if size == 1:
+        if len(header) < 16:
+            return None
+        size = struct.unpack('>Q', header[8:16])[0]
+        header_size = 16
+    elif size == 0:
+        size = available
+    if size < header_size or size > available or not all(32 <= c < 127 for c in box_type):
+        return None
+    return box_type, size, header_size
+
+
+def read_top_level_boxes(f, file_size):
+    """(type, offset, size, header_size) for each top-level box, found by seeking.
+    
+    Stops at the first bytes that do not parse as a box (e.g. data appended to the file).
+    """
+    boxes = []
+    offset = 0
+    while offset < file_size:
+        f.seek(offset)
+        parsed = _box_header(f.read(16), file_size - offset)
+        if parsed is None:
+            break
+        box_type, size, header_size = parsed
+        boxes.append((box_type, offset, size, header_size))
+        offset += size
+    return boxes
+
+
+def _child_boxes(buf, start, end):
+    """(type, offset, size, header_size) for the boxes in buf[start:end], and where they stop"""
+    boxes = []
+    pos = start
+    while pos < end:
+        parsed = _box_header(bytes(buf[pos:pos + 16]), end - pos)
+        if parsed is None:
+            break
+        box_type, size, header_size = parsed
+        boxes.append((box_type, pos, size, header_size))
+        pos += size
+    return boxes, pos
+
+
+def _shift_chunk_offsets(moov, start, end, moved_from, delta):
+    """Add delta to every stco/co64 entry at or after moved_from, in place"""
+    boxes, _ = _child_boxes(moov, start, end)
+    for box_type, pos, size, header_size in boxes:
+        body = pos + header_size
+        if box_type in MP4_OFFSET_CONTAINERS:
+            _shift_chunk_offsets(moov, body, pos + size, moved_from, delta)
+        elif box_type in (b'stco', b'co64'):
+            entry_format, entry_size = ('>I', 4) if box_type == b'stco' else ('>Q', 8)
+            count = struct.unpack_from('>I', moov, body + 4)[0]
+            for i in range(count):
+                at = body + 8 + i * entry_size
+                offset = struct.unpack_from(entry_format, moov, at)[0]
+                if offset >= moved_from:
+                    if box_type == b'stco' and offset + delta > 0xFFFFFFFF:
+                        raise OverflowError("Chunk offset no longer fits in stco")
+                    struct.pack_into(entry_format, moov, at, offset + delta)
+
+
+def _moov_with_payload(moov, header_size, payload_box):
+    """New moov bytes with payload_box in its udta, replacing an earlier stego uuid box"""
+    children, end = _child_boxes(moov, header_size, len(moov))
+    parts = []
+    udta_body = None
+    for box_type, pos, size, child_header in children:
+        if box_type == b'udta' and udta_body is None:
+            # Keep udta's other boxes, and any trailing bytes such as QuickTime's zero terminator
+            entries, entries_end = _child_boxes(moov, pos + child_header, pos + size)
+            kept = [
+                bytes(moov[p:p + s]) for t, p, s, h in entries
+                if not (t == b'uuid' and moov[p + h:p + h + 16] == STEGO_UUID)
+            ]
+            udta_body = b''.join(kept) + payload_box + bytes(moov[entries_end:pos + size])
+            parts.append(None)
+        else:
+            parts.append(bytes(moov[pos:pos + size]))
+    
+    if udta_body is None:
+        udta_body = payload_box
+        parts.append(None)
+    udta = struct.pack('>I4s', 8 + len(udta_body), b'udta') + udta_body
+    body = b''.join(udta if part is None else part for part in parts) + bytes(moov[end:])
+    return bytearray(struct.pack('>I4s', 8 + len(body), b'moov') + body)
+
+
+def mp4_insert_metadata(video_path, output_path, block):
+    """Write video_path to output_path with block inside a moov/udta uuid box.
+    
+    Only moov is rebuilt; the boxes around it are copied unchanged, and chunk offsets
+    pointing past moov are shifted by its growth. Returns False (writing nothing) if
+    the file is not MP4/MOV or is fragmented.
+    """
+    file_size = os.path.getsize(video_path)
+    with open(video_path, 'rb', buffering=0) as src:
+        boxes = read_top_level_boxes(src, file_size)
+        types = [box[0] for box in boxes]
+        if not boxes or types[0] not in MP4_FIRST_BOXES or b'moov' not in types or b'moof' in types:
+            return False
+        
+        _, moov_offset, moov_size, header_size = boxes[types.index(b'moov')]
+        src.seek(moov_offset)
+        moov = bytearray(src.read(moov_size))
+        
+        payload_box = struct.pack('>I4s', 24 + len(block), b'uuid') + STEGO_UUID + block
+        new_moov = _moov_with_payload(moov, header_size, payload_box)
+        delta = len(new_moov) - moov_size
+        try:
+            _shift_chunk_offsets(new_moov, 8, len(new_moov), moov_offset + moov_size, delta)
+        except OverflowError:
+            return False
+        
+        src.seek(0)
+        with open(output_path, 'wb', buffering=0) as dst:
+            copy_bytes(src.fileno(), dst.fileno(), moov_offset)
+            write_all(dst.fileno(), new_moov)
+            src.seek(moov_offset + moov_size)
+            copy_bytes(src.fileno(), dst.fileno(), file_size - moov_offset - moov_size)
+    return True
+
+
 class VideoPage(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
@@ -23,10 +572,15 @@ class VideoPage(tk.Frame):
         
         # State variables
         self.source_video_path = ""
+        self.source_frames = None  # (width, height, frame count) for the LSB capacity
         self.output_video_path = ""
         self.encoded_video_path = ""
         self.encoding_in_progress = False
         self.decoding_in_progress = False
+        self.encode_stats = None
+        
+        # Worker threads post UI updates here; the Tk loop drains it
+        self.job_queue = queue.Queue()
         
         # Setup page
         self.setup_page()
@@ -326,6 +880,106 @@ class VideoPage(tk.Frame):
         )
         self.method_info_label.pack(anchor="w", pady=(0, 10))
         
+        # LSB output codec, encoder preset and thread count
+        codec_frame = tk.Frame(method_frame, bg=self.COLORS['card_bg'])
+        codec_frame.pack(fill="x", pady=(0, 10))
+        
+        self.codec_var = tk.StringVar(value="x264 lossless")
+        self.preset_var = tk.StringVar(value="veryfast")
+        self.threads_var = tk.StringVar(value="0")
+        self.stride_var = tk.StringVar(value="1")
+        
+        tk.Label(
+            codec_frame,
+            text="Codec:",
+            font=("Segoe UI", 9),
+            fg=self.COLORS['text'],
+            bg=self.COLORS['card_bg']
+        ).pack(side="left")
+        
+        self.codec_menu = tk.OptionMenu(codec_frame, self.codec_var, *VIDEO_CODECS, command=self.on_codec_change)
+        self.preset_menu = tk.OptionMenu(codec_frame, self.preset_var, *X264_PRESETS)
+        for menu in (self.codec_menu, self.preset_menu):
+            menu.config(
+                font=("Segoe UI", 9),
+                fg=self.COLORS['text'],
+                bg="#0f151f",
+                activebackground="#2a3546",
+                highlightthickness=0
+            )
+        self.codec_menu.pack(side="left", padx=(5, 10))
+        
+        tk.Label(
+            codec_frame,
+            text="Preset:",
+            font=("Segoe UI", 9),
+            fg=self.COLORS['text'],
+            bg=self.COLORS['card_bg']
+        ).pack(side="left")
+        self.preset_menu.pack(side="left", padx=(5, 10))
+        
+        tk.Label(
+            codec_frame,
+            text="Threads:",
+            font=("Segoe UI", 9),
+            fg=self.COLORS['text'],
+            bg=self.COLORS['card_bg']
+        ).pack(side="left")
+        
+        # 0 lets ffmpeg pick the thread count
+        self.threads_spin = tk.Spinbox(
+            codec_frame,
+            from_=0,
+            to=64,
+            textvariable=self.threads_var,
+            font=("Segoe UI", 9),
+            fg=self.COLORS['text'],
+            bg="#0f151f",
+            width=3
+        )
+        self.threads_spin.pack(side="left", padx=(5, 10))
+        
+        tk.Label(
+            codec_frame,
+            text="Stride:",
+            font=("Segoe UI", 9),
+            fg=self.COLORS['text'],
+            bg=self.COLORS['card_bg']
+        ).pack(side="left")
+        
+        # Payload goes into every Nth frame; 1 fills consecutive frames
+        self.stride_spin = tk.Spinbox(
+            codec_frame,
+            from_=1,
+            to=300,
+            textvariable=self.stride_var,
+            command=self.update_hide_counter,
+            font=("Segoe UI", 9),
+            fg=self.COLORS['text'],
+            bg="#0f151f",
+            width=3
+        )
+        self.stride_spin.pack(side="left", padx=(5, 0))
+        
+        # The stride changes how much the source frames can carry
+        self.stride_spin.bind("<KeyRelease>", self.update_hide_counter)
+        
+        # Only the GOPs carrying payload are re-encoded when the source stream allows it
+        self.gop_copy_var = tk.BooleanVar(value=True)
+        self.gop_copy_check = tk.Checkbutton(
+            method_frame,
+            text="Re-encode payload GOPs only (copy the rest)",
+            variable=self.gop_copy_var,
+            font=("Segoe UI", 9),
+            fg=self.COLORS['text'],
+            bg=self.COLORS['card_bg'],
+            activebackground=self.COLORS['card_bg'],
+            activeforeground=self.COLORS['primary'],
+            selectcolor=self.COLORS['bg'],
+            cursor="hand2"
+        )
+        self.gop_copy_check.pack(anchor="w", pady=(0, 10))
+        
         # ===== PASSWORD FIELD =====
         tk.Label(
             parent,
@@ -872,6 +1526,30 @@ class VideoPage(tk.Frame):
             self.method_info_label.config(text="Hide message in video metadata")
         else:  # EOF
             self.method_info_label.config(text="Hide message at end of video file")
+        
+        # Codec options only apply to LSB, which re-encodes the frames
+        state = "normal" if method == "LSB" else "disabled"
+        self.codec_menu.config(state=state)
+        self.threads_spin.config(state=state)
+        self.stride_spin.config(state=state)
+        self.on_codec_change()
+    
+    def on_codec_change(self, value=None):
+        """Enable the preset for x264 and keep the output extension valid for the codec"""
+        codec = VIDEO_CODECS[self.codec_var.get()]
+        lsb = self.method_var.get() == "LSB"
+        x264 = codec["args"] is not None and 'libx264rgb' in codec["args"]
+        self.preset_menu.config(state="normal" if lsb and x264 else "disabled")
+        self.gop_copy_check.config(state="normal" if lsb and codec["args"] is not None else "disabled")
+        
+        output_file = self.output_entry.get()
+        if lsb and codec["extensions"] and self.output_video_path:
+            root, ext = os.path.splitext(output_file)
+            if ext.lower() not in codec["extensions"]:
+                output_file = root + codec["extensions"][0]
+                self.output_entry.delete(0, tk.END)
+                self.output_entry.insert(0, output_file)
+                self.output_video_path = output_file
     
     # ===== FILE SELECTION METHODS =====
     
@@ -889,6 +1567,8 @@ class VideoPage(tk.Frame):
             self.source_entry.insert(0, file_path)
             self.source_entry.config(fg=self.COLORS['text'])
             self.source_video_path = file_path
+            self.source_frames = self._read_frame_layout(file_path)
+            self.update_hide_counter()
             self.update_status(f"Source: {os.path.basename(file_path)}")
     
     def select_output_video(self):
@@ -898,18 +1578,20 @@ class VideoPage(tk.Frame):
             defaultextension=".mp4",
             filetypes=[
                 ("MP4 Video", "*.mp4"),
+                ("Matroska Video", "*.mkv"),
                 ("AVI Video", "*.avi"),
                 ("All Files", "*.*")
             ]
         )
         if file_path:
-            if not file_path.lower().endswith('.mp4'):
+            if not file_path.lower().endswith(('.mp4', '.mkv', '.avi')):
                 file_path += '.mp4'
             
             self.output_entry.delete(0, tk.END)
             self.output_entry.insert(0, file_path)
             self.output_entry.config(fg=self.COLORS['text'])
             self.output_video_path = file_path
+            self.on_codec_change()
     
     def select_encoded_video(self):
         """Select encoded video for decoding"""
@@ -927,6 +1609,16 @@ class VideoPage(tk.Frame):
             self.encoded_video_path = file_path
             self.update_status(f"Encoded: {os.path.basename(file_path)}")
     
+    def _read_frame_layout(self, video_path):
+        """(width, height, frame count) of video_path, or None when OpenCV cannot tell"""
+        cap = cv2.VideoCapture(video_path)
+        try:
+            layout = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                      int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+        finally:
+            cap.release()
+        return layout if all(value > 0 for value in layout) else None
+    
     def show_video_info(self):
         """Show video information"""
         if not self.source_video_path:
@@ -991,7 +1683,21 @@ class VideoPage(tk.Frame):
         
         # Change color based on length
         method = self.method_var.get()
-        if method == "LSB":
+        if method == "LSB" and self.source_frames:
+            # Fernet token for the text against what every stride-th frame of the source holds
+            width, height, total_frames = self.source_frames
+            stride = self._read_stride()
+            header = LSB_SPREAD_HEADER if stride > 1 else LSB_HEADER
+            capacity = max(1, -(-total_frames // stride) * width * height * 3 // 8 - header.size)
+            token = 4 * -(-(57 + (len(text.encode('utf-8')) // 16 + 1) * 16) // 3)
+            self.hide_char_count.config(text=f"Characters: {count} ({100 * token / capacity:.0f}% of capacity)")
+            if token > capacity:
+                self.hide_char_count.config(fg=self.COLORS['accent'])
+            elif token > capacity * 0.8:
+                self.hide_char_count.config(fg="#ffaa00")
+            else:
+                self.hide_char_count.config(fg="#666666")
+        elif method == "LSB":
             # LSB has high capacity, warning at 5000 chars
             if count > 5000:
                 self.hide_char_count.config(fg=self.COLORS['accent'])
@@ -1053,129 +1759,372 @@ class VideoPage(tk.Frame):
     
     # ===== LSB METHOD =====
     
-    def lsb_encode(self, video_path, message, output_path):
+    def _read_stride(self):
+        """Payload frame stride from the spinbox (1 = every frame)"""
+        try:
+            return max(1, int(self.stride_var.get()))
+        except ValueError:
+            return 1
+    
+    def _lsb_settings(self):
+        """LSB output settings for lsb_encode, read on the Tk thread"""
+        try:
+            threads = max(0, int(self.threads_var.get()))
+        except ValueError:
+            threads = 0
+        return {
+            'codec_name': self.codec_var.get(),
+            'preset': self.preset_var.get(),
+            'threads': threads,
+            'stride': self._read_stride(),
+            'gop_copy': self.gop_copy_var.get(),
+        }
+    
+    def lsb_encode(self, video_path, message, output_path, password, codec_name,
+                   preset=None, threads=0, stride=1, gop_copy=False):
         """LSB encoding in video frames"""
         try:
             # Encrypt message
-            password = self.hide_password.get()
             encrypted_message = self.encrypt_message(message, password)
             
-            # Convert to binary with marker
-            message_with_marker = encrypted_message + "###END###"
-            binary_message = ''.join(format(ord(c), '08b') for c in message_with_marker)
+            # Output codec settings
+            codec = VIDEO_CODECS[codec_name]
+            extension = os.path.splitext(output_path)[1].lower()
+            if codec["extensions"] and extension not in codec["extensions"]:
+                raise ValueError(f"{codec_name} output must be one of: {', '.join(codec['extensions'])}")
+            
+            # The preset only applies to x264
+            if codec["args"] is None or 'libx264rgb' not in codec["args"]:
+                preset = None
+            
+            # The message behind the length header, kept packed: each frame unpacks its own bits
+            message_bytes = encrypted_message.encode('utf-8')
+            if stride > 1:
+                header = LSB_SPREAD_HEADER.pack(LSB_SPREAD_MAGIC, len(message_bytes), stride)
+            else:
+                header = LSB_HEADER.pack(LSB_MAGIC, len(message_bytes))
+            payload = np.frombuffer(header + message_bytes, dtype=np.uint8)
+            payload_bits = payload.size * 8
             
             # Open video
             cap = cv2.VideoCapture(video_path)
             if not cap.isOpened():
                 raise Exception("Cannot open video file")
             
-            fps = int(cap.get(cv2.CAP_PROP_FPS))
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            
-            # Video writer
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-            
-            bit_index = 0
-            frame_count = 0
-            
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
+            # Written to a temp file with the same extension (ffmpeg picks the container
+            # from it) and renamed over output_path only once complete
+            root, extension = os.path.splitext(output_path)
+            temp_path = root + '.part' + extension
+            out = None
+            try:
+                fps = cap.get(cv2.CAP_PROP_FPS) or 30
+                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
                 
-                if bit_index < len(binary_message):
-                    # Encode bits in this frame
-                    encoded_frame = self._lsb_encode_frame(frame, binary_message, bit_index)
-                    frame_capacity = width * height * 3  # 3 channels
-                    bit_index += frame_capacity
-                else:
-                    encoded_frame = frame
+                # Frames up to the last one carrying payload
+                frames_needed = -(-payload_bits // (width * height * 3))
+                payload_span = (frames_needed - 1) * stride + 1
                 
-                out.write(encoded_frame)
-                frame_count += 1
+                # Widely spaced payload frames become keyframes, so extraction seeks straight to them
+                codec_args = codec["args"]
+                if codec_args is not None and stride > LSB_SEEK_MIN_GAP:
+                    codec_args = codec_args + ['-force_key_frames', f'expr:lt(n,{payload_span})*not(mod(n,{stride}))']
                 
-                # Update progress
-                if frame_count % 10 == 0:
-                    progress = min(100, (bit_index / len(binary_message)) * 100)
-                    self.progress_var.set(int(progress))
-                    self.update_status(f"Encoding frame {frame_count}/{total_frames} ({progress:.1f}%)", "info")
+                # Lossless codecs decode through an ffmpeg pipe as well; cv2 only reads the properties
+                if codec["args"] is not None:
+                    cap.release()
+                    cap = FFmpegFrameReader(video_path, (width, height))
                 
-                if bit_index >= len(binary_message):
-                    # Copy remaining frames
-                    while True:
-                        ret, remaining_frame = cap.read()
-                        if not ret:
-                            break
-                        out.write(remaining_frame)
-                    break
-            
-            cap.release()
-            out.release()
-            
-            if bit_index < len(binary_message):
-                raise ValueError(f"Video too short! Could only encode {bit_index//8} chars, needed {len(binary_message)//8}")
-            
-            # Preserve audio by merging with ffmpeg
-            try:
-                temp_audio = output_path + '_temp_audio.aac'
-                final_output = output_path
+                start_time = time.time()
                 
-                # Extract audio from original video
-                subprocess.run([
-                    'ffmpeg', '-i', video_path, '-vn', '-acodec', 'copy', temp_audio
-                ], check=True, capture_output=True)
+                # Re-encode only up to the first keyframe after the payload and copy the rest,
+                # provided our encoder produces the same stream the source already has
+                if codec["args"] is not None and gop_copy:
+                    cut = probe_keyframe_cut(video_path, payload_span)
+                    if cut and cut['signature'][0] != codec["codec_id"]:
+                        cut = None
+                    if cut:
+                        reencoded = self._lsb_encode_gops(
+                            cap, video_path, temp_path, payload, cut,
+                            (width, height), codec_args, preset, threads, total_frames, stride
+                        )
+                        if reencoded is not None:
+                            os.replace(temp_path, output_path)
+                            elapsed = time.time() - start_time
+                            self.encode_stats = {
+                                'codec': f"{codec_name} ({preset})" if preset else codec_name,
+                                'seconds': elapsed,
+                                'fps': reencoded / elapsed if elapsed > 0 else 0.0,
+                                'reencoded': reencoded,
+                            }
+                            return True
+                        
+                        # Different codec settings: start over with a full encode
+                        self._post(self.update_status, "Source stream differs from the output codec, re-encoding everything", "warning")
+                        cap.release()
+                        cap = FFmpegFrameReader(video_path, (width, height))
                 
-                # Merge video with audio
-                temp_video = output_path + '_temp_video.mp4'
-                os.rename(output_path, temp_video)
+                # Video writer: lossless codecs go through an ffmpeg pipe that also copies the audio
+                if codec["args"] is None:
+                    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+                    out = cv2.VideoWriter(temp_path, fourcc, fps, (width, height))
+                else:
+                    out = FFmpegFrameWriter(temp_path, fps, (width, height), codec_args, preset, threads,
+                                            audio_source=video_path)
                 
-                subprocess.run([
-                    'ffmpeg', '-i', temp_video, '-i', temp_audio, 
-                    '-c:v', 'copy', '-c:a', 'aac', '-map', '0:v:0', '-map', '1:a:0', 
-                    '-shortest', final_output
-                ], check=True, capture_output=True)
+                bit_index, frame_count = self._lsb_encode_frames(cap, out, payload, total_frames, stride=stride)
                 
-                # Clean up temp files
-                if os.path.exists(temp_video):
-                    os.remove(temp_video)
-                if os.path.exists(temp_audio):
-                    os.remove(temp_audio)
-                    
-            except subprocess.CalledProcessError as e:
-                # If ffmpeg fails, keep the video without audio
-                self.update_status("Warning: Could not preserve audio (ffmpeg not found or failed)", "warning")
-            except FileNotFoundError:
-                self.update_status("Warning: ffmpeg not installed, video saved without audio", "warning")
-            
+                cap.release()
+                writer, out = out, None
+                writer.release()
+                elapsed = time.time() - start_time
+                
+                if bit_index < payload_bits:
+                    raise ValueError(f"Video too short! Could only encode {bit_index//8} chars, needed {payload.size}")
+                
+                # The OpenCV writer drops audio, so merge it back in
+                if codec["args"] is None:
+                    self._merge_source_audio(video_path, temp_path)
+                
+                os.replace(temp_path, output_path)
+            finally:
+                cap.release()
+                if isinstance(out, FFmpegFrameWriter):
+                    out.abort()
+                elif out is not None:
+                    out.release()
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            
+            # Speed/size figures so presets can be compared
+            self.encode_stats = {
+                'codec': f"{codec_name} ({preset})" if preset else codec_name,
+                'seconds': elapsed,
+                'fps': frame_count / elapsed if elapsed > 0 else 0.0,
+            }
             return True
             
         except Exception as e:
             raise Exception(f"LSB encoding failed: {str(e)}")
     
-    def _lsb_encode_frame(self, frame, binary_message, start_index):
-        """Encode bits in a single frame"""
-        height, width, channels = frame.shape
+    def _merge_source_audio(self, video_path, output_path):
+        """Preserve audio by merging with ffmpeg (temp video keeps the output's container)"""
+        try:
+            temp_audio = output_path + '_temp_audio.aac'
+            final_output = output_path
+            root, extension = os.path.splitext(output_path)
+            
+            # Extract audio from original video
+            subprocess.run([
+                'ffmpeg', '-i', video_path, '-vn', '-acodec', 'copy', temp_audio
+            ], check=True, capture_output=True)
+            
+            # Merge video with audio
+            temp_video = root + '_temp_video' + extension
+            os.rename(output_path, temp_video)
+            
+            subprocess.run([
+                'ffmpeg', '-i', temp_video, '-i', temp_audio, 
+                '-c:v', 'copy', '-c:a', 'aac', '-map', '0:v:0', '-map', '1:a:0', 
+                '-shortest', final_output
+            ], check=True, capture_output=True)
+            
+            # Clean up temp files
+            if os.path.exists(temp_video):
+                os.remove(temp_video)
+            if os.path.exists(temp_audio):
+                os.remove(temp_audio)
+                
+        except subprocess.CalledProcessError as e:
+            # If ffmpeg fails, keep the video without audio
+            self._post(self.update_status, "Warning: Could not preserve audio (ffmpeg not found or failed)", "warning")
+        except FileNotFoundError:
+            self._post(self.update_status, "Warning: ffmpeg not installed, video saved without audio", "warning")
+    
+    def _lsb_encode_frames(self, cap, out, payload, total_frames, frame_limit=None, workers=None, stride=1):
+        """Embed the message into every stride-th frame read from cap, writing up to
+        frame_limit frames to out.
+        
+        Reading and writing run on their own threads, joined to the embedding loop by
+        bounded queues, so the decoder, the embed and the encoder overlap. When the payload
+        fills many consecutive frames of an ffmpeg-decoded source, the embed itself is spread
+        over a pool of worker processes and frames travel as shared-memory slot indices.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        payload_bits = payload.size * 8
+        
+        # Spread payloads embed far less often than frames are decoded, so only
+        # consecutive payload frames are worth a pool
+        embedder = None
+        if (workers > 1 and stride == 1 and isinstance(cap, FFmpegFrameReader)
+                and payload_bits >= EMBED_POOL_MIN_FRAMES * cap.frame_bytes):
+            embedder = SharedFrameEmbedder(payload, cap.shape, workers)
+        
+        # With the pool, the slot ring is what bounds the frames in flight
+        read_queue = queue.Queue(PIPELINE_DEPTH)
+        write_queue = queue.Queue(0 if embedder else PIPELINE_DEPTH)
+        stop = threading.Event()
+        errors = []
+        
+        def put(q, item):
+            # Give up instead of blocking forever once another stage has failed
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def get(q):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            return None
+        
+        def next_slot():
+            while not stop.is_set():
+                index = embedder.acquire(0.1)
+                if index is not None:
+                    return index
+            return None
+        
+        def reader():
+            try:
+                count = 0
+                while frame_limit is None or count < frame_limit:
+                    if embedder:
+                        item = next_slot()
+                        if item is None:
+                            break
+                        if not cap.readinto(embedder.frames[item]):
+                            embedder.release(item)
+                            break
+                    else:
+                        ret, item = cap.read()
+                        if not ret:
+                            break
+                    if not put(read_queue, item):
+                        break
+                    count += 1
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                put(read_queue, None)
+        
+        def writer():
+            try:
+                while True:
+                    item = get(write_queue)
+                    if item is None:
+                        break
+                    if embedder:
+                        # The slot goes back to the reader only once the encoder has it
+                        future, index = item
+                        if future:
+                            future.result()
+                        out.write(embedder.frames[index])
+                        embedder.release(index)
+                    else:
+                        out.write(item)
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+        
+        stages = [threading.Thread(target=reader, daemon=True), threading.Thread(target=writer, daemon=True)]
+        for stage in stages:
+            stage.start()
+        
+        bit_index = 0
+        frame_count = 0
+        read_count = 0
+        started = time.time()
+        
+        try:
+            while True:
+                item = get(read_queue)
+                if item is None:
+                    break
+                
+                if bit_index < payload_bits and read_count % stride == 0:
+                    # Encode bits in this frame
+                    if embedder:
+                        item = (embedder.embed(item, bit_index), item)
+                        bit_index += embedder.frame_bytes
+                    else:
+                        item = self._lsb_encode_frame(item, payload, bit_index)
+                        bit_index += item.shape[0] * item.shape[1] * 3  # 3 channels
+                elif embedder:
+                    item = (None, item)
+                read_count += 1
+                
+                if not put(write_queue, item):
+                    break
+                frame_count += 1
+                self._report_progress(frame_count, frame_limit or total_frames, "Encoding frame", started)
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            put(write_queue, None)
+            for stage in stages:
+                stage.join()
+            if embedder:
+                embedder.close()
+        
+        if errors:
+            raise errors[0]
+        return bit_index, frame_count
+    
+    def _lsb_encode_gops(self, cap, video_path, output_path, payload, cut,
+                         size, codec_args, preset, threads, total_frames, stride=1):
+        """Re-encode the frames before cut and stream-copy the rest of video_path.
+        
+        Returns the number of re-encoded frames, or None when the new head cannot be
+        joined to the source stream by copy (nothing is written to output_path then).
+        """
+        # The head is muxed like the source, so its timestamps line up with the copied part
+        root, extension = os.path.splitext(output_path)
+        head_path = root + '_temp_head' + (os.path.splitext(video_path)[1] or extension)
+        out = None
+        try:
+            out = FFmpegFrameWriter(head_path, cut['rate'] or cap.get(cv2.CAP_PROP_FPS) or 30,
+                                    size, codec_args, preset, threads, cut['sar'])
+            bit_index, frame_count = self._lsb_encode_frames(
+                cap, out, payload, total_frames, cut['frames'], stride=stride
+            )
+            writer, out = out, None
+            writer.release()
+            
+            if bit_index < payload.size * 8 or video_stream_signature(head_path) != cut['signature']:
+                return None
+            
+            self._post(self.update_status, f"Copying the video after frame {frame_count}...", "info")
+            concat_stream_copy(head_path, video_path, cut['inpoint'], output_path)
+            return frame_count
+        finally:
+            if out is not None:
+                out.abort()
+            if os.path.exists(head_path):
+                os.remove(head_path)
+    
+    def _lsb_encode_frame(self, frame, payload, start_index):
+        """Encode bits in a single frame using one numpy operation"""
         encoded_frame = frame.copy()
         
-        bit_index = start_index
+        # RGB channels only, flattened in (y, x, c) order to match _lsb_decode_frame
+        channels = np.ascontiguousarray(encoded_frame[:, :, :3])
+        flat = channels.reshape(-1)
         
-        for y in range(height):
-            for x in range(width):
-                for c in range(min(channels, 3)):  # RGB channels
-                    if bit_index >= len(binary_message):
-                        return encoded_frame
-                    
-                    # Get bit value
-                    bit = int(binary_message[bit_index])
-                    
-                    # Modify LSB
-                    encoded_frame[y, x, c] = (encoded_frame[y, x, c] & 0xFE) | bit
-                    
-                    bit_index += 1
+        count = min(flat.size, payload.size * 8 - start_index)
+        flat[:count] = (flat[:count] & 0xFE) | _payload_bits(payload, start_index, count)
         
+        encoded_frame[:, :, :3] = channels
         return encoded_frame
     
     def lsb_decode(self, video_path):
@@ -1186,84 +2135,127 @@ class VideoPage(tk.Frame):
             if not cap.isOpened():
                 raise Exception("Cannot open video file")
             
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            
-            binary_message = ""
-            frame_capacity = width * height * 3
-            frame_count = 0
-            max_frames = 1000  # Limit to prevent infinite processing
+            try:
+                return self._lsb_read_message(cap, video_path)
+            finally:
+                cap.release()
             
+        except Exception as e:
+            raise Exception(f"LSB decoding failed: {str(e)}")
+    
+    def _lsb_read_message(self, cap, video_path):
+        """Read the message from cap, decoding only the frames the payload spans.
+        
+        The first frame decides the layout: an LSB_MAGIC header gives the message
+        length, an LSB_SPREAD_MAGIC header also the stride between payload frames
+        (grabbed past or seeked to), a legacy "gAAAAA" token is read up to ###END###,
+        and anything else is rejected after that one frame.
+        """
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        
+        marker = b"###END###"
+        data = bytearray()
+        leftover = np.zeros(0, dtype=np.uint8)  # bits that did not fill a byte yet
+        frame_capacity = width * height * 3
+        frame_count = 0
+        payload_size = None  # header + message bytes, once the header is read
+        header_size = 0
+        stride = 1
+        seek_reader = None  # reads just the payload keyframes, when seeking pays off
+        checked = 0  # legacy bytes already matched against the token alphabet
+        started = time.time()
+        
+        try:
             while True:
-                ret, frame = cap.read()
+                # Spread payloads: read the next payload keyframe, or skip the frames between
+                # without converting them
+                if seek_reader:
+                    ret, frame = seek_reader.read()
+                else:
+                    if frame_count:
+                        for _ in range(stride - 1):
+                            cap.grab()
+                    ret, frame = cap.read()
                 if not ret:
                     break
                 
-                # Decode bits from frame
+                # Decode bits from frame and pack them into whole bytes
                 frame_bits = self._lsb_decode_frame(frame)
-                binary_message += frame_bits
+                if leftover.size:
+                    frame_bits = np.concatenate((leftover, frame_bits))
+                whole = frame_bits.size - frame_bits.size % 8
+                leftover = frame_bits[whole:]
+                data += np.packbits(frame_bits[:whole]).tobytes()
                 
                 frame_count += 1
                 
-                # Safety check: limit processing to prevent hanging
-                if frame_count > max_frames:
-                    raise Exception(f"Processing limit reached ({max_frames} frames). Video may be too large or corrupted.")
+                if frame_count == 1:
+                    if data.startswith(LSB_MAGIC):
+                        _, message_len = LSB_HEADER.unpack_from(data)
+                        header_size = LSB_HEADER.size
+                    elif data.startswith(LSB_SPREAD_MAGIC):
+                        _, message_len, stride = LSB_SPREAD_HEADER.unpack_from(data)
+                        header_size = LSB_SPREAD_HEADER.size
+                        if stride < 1:
+                            raise Exception("Invalid LSB header - bad frame stride")
+                    elif not data.startswith(b"gAAAAA"):
+                        raise Exception("No LSB message found")
+                    
+                    if header_size:
+                        payload_size = header_size + message_len
+                        payload_frames = -(-payload_size * 8 // frame_capacity)
+                        if total_frames > 0 and payload_frames > -(-total_frames // stride):
+                            raise Exception("Invalid LSB header - length exceeds video capacity")
+                        if stride > LSB_SEEK_MIN_GAP and payload_frames > 1:
+                            try:
+                                seek_times = payload_keyframe_times(video_path, stride, payload_frames)
+                            except Exception:
+                                seek_times = None  # no ffmpeg: grab through the gaps instead
+                            if seek_times:
+                                seek_reader = FFmpegFrameReader(video_path, (width, height),
+                                                                frame_times=seek_times[1:])
                 
-                # Update progress
-                if frame_count % 10 == 0:
-                    progress = min(100, (len(binary_message) / (frame_capacity * 10)) * 100)
-                    self.progress_var.set(int(progress))
-                    self.update_status(f"Decoding frame {frame_count}/{total_frames} ({progress:.1f}%)", "info")
+                if payload_size is not None:
+                    # Length-aware layout: stop once the payload is complete
+                    if len(data) >= payload_size:
+                        return data[header_size:payload_size].decode('latin-1')
+                else:
+                    # Legacy layout: only the new bytes (plus a marker-sized overlap) need searching
+                    marker_index = data.find(marker, checked)
+                    end = marker_index if marker_index != -1 else len(data) - len(marker) + 1
+                    if data[checked:end].translate(None, LSB_TOKEN_CHARS):
+                        raise Exception("End marker not found")
+                    if marker_index != -1:
+                        # Each byte maps to one character, as the encoder wrote them
+                        return data[:marker_index].decode('latin-1')
+                    checked = end
                 
-                # Check for end marker
-                if "###END###" in self._binary_to_string(binary_message):
-                    break
-            
-            cap.release()
-            
-            # Convert binary to string
-            text = self._binary_to_string(binary_message)
-            if "###END###" in text:
-                encrypted_message = text.replace("###END###", "")
-                return encrypted_message
-            else:
-                raise Exception("End marker not found")
-            
-        except Exception as e:
-            raise Exception(f"LSB decoding failed: {str(e)}")
+                self._report_progress(frame_count, payload_frames if payload_size is not None else total_frames,
+                                      "Decoding frame", started)
+        finally:
+            if seek_reader:
+                seek_reader.release()
+        
+        if payload_size is not None:
+            raise Exception("Video ended before the end of the message")
+        raise Exception("End marker not found")
     
     def _lsb_decode_frame(self, frame):
         """Decode bits from a single frame using numpy for faster processing"""
-        # Extract LSB from RGB channels only (first 3 channels)
+        # Extract LSB from RGB channels only (first 3 channels), flattened in (y, x, c) order
         lsb_bits = frame[:, :, :3] & 1
-        # Flatten and convert to string
-        binary_message = ''.join(map(str, lsb_bits.flatten()))
-        return binary_message
-    
-    def _binary_to_string(self, binary):
-        """Convert binary string to text"""
-        chars = []
-        for i in range(0, len(binary), 8):
-            if i + 8 > len(binary):
-                break
-            byte = binary[i:i+8]
-            chars.append(chr(int(byte, 2)))
-        return ''.join(chars)
+        return lsb_bits.reshape(-1)
     
     # ===== METADATA METHOD =====
     
-    def metadata_encode(self, video_path, message, output_path):
+    def metadata_encode(self, video_path, message, output_path, password):
         """Metadata encoding"""
         try:
             # Encrypt message
-            password = self.hide_password.get()
             encrypted_message = self.encrypt_message(message, password)
             
-            # Read original video
-            with open(video_path, 'rb') as f:
-                video_data = f.read()
-            
             # Create metadata
             metadata = {
                 'stego': 'true',
@@ -1277,126 +2269,268 @@ class VideoPage(tk.Frame):
             metadata_bytes = metadata_str.encode('utf-8')
             metadata_len = struct.pack('<I', len(metadata_bytes))
             
-            # Find a good place to insert (after major chunks)
-            insert_pos = len(video_data) - 100  # Near end of file
+            block = marker + metadata_len + metadata_bytes
             
-            # Insert metadata
-            encoded_data = (
-                video_data[:insert_pos] +
-                marker +
-                metadata_len +
-                metadata_bytes +
-                video_data[insert_pos:]
-            )
-            
-            # Write to output
-            with open(output_path, 'wb') as f:
-                f.write(encoded_data)
+            # Write into a temp file (the source may be the output)
+            temp_path = output_path + '.part'
+            try:
+                # MP4/MOV: a uuid box in moov/udta keeps the container valid
+                if not mp4_insert_metadata(video_path, temp_path, block):
+                    # Other containers: find a good place to insert (after major chunks)
+                    video_size = os.path.getsize(video_path)
+                    insert_pos = max(0, video_size - 100)  # Near end of file
+                    
+                    # Stream prefix, metadata block and tail
+                    with open(video_path, 'rb', buffering=0) as src, open(temp_path, 'wb', buffering=0) as dst:
+                        copy_bytes(src.fileno(), dst.fileno(), insert_pos)
+                        write_all(dst.fileno(), block)
+                        copy_bytes(src.fileno(), dst.fileno(), video_size - insert_pos)
+                os.replace(temp_path, output_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
             
             return True
             
         except Exception as e:
             raise Exception(f"Metadata encoding failed: {str(e)}")
     
-    def metadata_decode(self, video_path):
-        """Metadata decoding"""
+    def metadata_decode(self, video_path, f=None):
+        """Metadata decoding - never reads the whole file (f: an already open file)"""
         try:
-            # Read video file
-            with open(video_path, 'rb') as f:
-                data = f.read()
-            
-            # Look for metadata marker
-            marker = b'METASTEGO'
-            index = data.find(marker)
-            
-            if index == -1:
-                raise Exception("No metadata marker found")
-            
-            # Read metadata length
-            len_start = index + len(marker)
-            metadata_len = struct.unpack('<I', data[len_start:len_start+4])[0]
-            
-            # Read metadata
-            metadata_start = len_start + 4
-            metadata_end = metadata_start + metadata_len
-            
-            if metadata_end > len(data):
-                raise Exception("Invalid metadata length")
-            
-            metadata_bytes = data[metadata_start:metadata_end]
-            metadata_str = metadata_bytes.decode('utf-8')
-            metadata = json.loads(metadata_str)
-            
-            if metadata.get('stego') != 'true' or metadata.get('method') != 'metadata':
-                raise Exception("Invalid metadata format")
-            
-            encrypted_message = metadata['message']
-            return encrypted_message
+            if f is None:
+                with open(video_path, 'rb') as f:
+                    return self._metadata_read_message(f)
+            return self._metadata_read_message(f)
             
         except Exception as e:
             raise Exception(f"Metadata decoding failed: {str(e)}")
     
+    def _metadata_read_message(self, f, scan_limit=None):
+        """Search moov first for MP4/MOV, then the memory-mapped file from the end.
+        
+        scan_limit bounds the second search to that many trailing bytes.
+        """
+        marker = b'METASTEGO'
+        size = f.seek(0, os.SEEK_END)
+        
+        # MP4/MOV: the block sits in a moov/udta uuid box, so moov is all that is read.
+        # Files from the older encoder may have the block cut across the end of moov;
+        # a marker that does not parse there is left to the search below.
+        for box_type, offset, box_size, _ in read_top_level_boxes(f, size):
+            if box_type == b'moov':
+                f.seek(offset)
+                try:
+                    message = self._find_metadata_block(f.read(box_size), marker)
+                except Exception:
+                    message = None
+                if message is not None:
+                    return message
+        
+        if size == 0:
+            raise Exception("No metadata marker found")
+        
+        # Other files: the block is inserted near the end, and searching the mapping
+        # backwards pages in only the region it passes over
+        start = max(0, size - scan_limit) if scan_limit else 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            message = self._find_metadata_block(data, marker, start)
+        if message is None:
+            raise Exception("No metadata marker found")
+        return message
+    
+    def _find_metadata_block(self, data, marker, start=0):
+        """Message from the last valid marker + length + JSON block in data[start:], or None without a marker"""
+        index = data.rfind(marker, start)
+        error = None
+        while index != -1:
+            try:
+                # Read metadata length
+                len_start = index + len(marker)
+                metadata_len = struct.unpack('<I', data[len_start:len_start+4])[0]
+                
+                # Read metadata
+                metadata_start = len_start + 4
+                metadata_end = metadata_start + metadata_len
+                
+                if metadata_end > len(data):
+                    raise ValueError("Invalid metadata length")
+                
+                metadata_str = bytes(data[metadata_start:metadata_end]).decode('utf-8')
+                metadata = json.loads(metadata_str)
+                
+                if not isinstance(metadata, dict) or metadata.get('stego') != 'true' or metadata.get('method') != 'metadata':
+                    raise ValueError("Invalid metadata format")
+                
+                return metadata['message']
+            except (ValueError, KeyError, struct.error) as e:
+                # Marker bytes inside media data: keep looking further back
+                error = e
+                index = data.rfind(marker, start, index)
+        
+        if error is not None:
+            raise Exception(str(error))
+        return None
+    
     # ===== EOF METHOD =====
     
-    def eof_encode(self, video_path, message, output_path):
+    def eof_encode(self, video_path, message, output_path, password):
         """EOF injection encoding"""
         try:
             # Encrypt message
-            password = self.hide_password.get()
             encrypted_message = self.encrypt_message(message, password)
             
-            # Read original video
-            with open(video_path, 'rb') as f:
-                video_data = f.read()
-            
-            # Create marker and data
-            marker = b'EOFSTEGO'
+            # Message followed by a fixed-size trailer, so decoding reads only the end
             message_bytes = encrypted_message.encode('utf-8')
-            message_len = struct.pack('<I', len(message_bytes))
-            
-            # Append to video (true EOF injection)
-            encoded_data = video_data + marker + message_len + message_bytes
+            trailer = EOF_TRAILER.pack(len(message_bytes), EOF_MARKER)
             
-            # Write to output
-            with open(output_path, 'wb') as f:
-                f.write(encoded_data)
+            # Append to video (true EOF injection), streaming the original through a temp file
+            temp_path = output_path + '.part'
+            try:
+                with open(video_path, 'rb', buffering=0) as src, open(temp_path, 'wb', buffering=0) as dst:
+                    copy_bytes(src.fileno(), dst.fileno(), os.fstat(src.fileno()).st_size)
+                    write_all(dst.fileno(), message_bytes + trailer)
+                os.replace(temp_path, output_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
             
             return True
             
         except Exception as e:
             raise Exception(f"EOF encoding failed: {str(e)}")
     
-    def eof_decode(self, video_path):
-        """EOF injection decoding"""
+    def eof_decode(self, video_path, f=None):
+        """EOF injection decoding - reads only the end of the file (f: an already open file)"""
         try:
-            # Read video file
-            with open(video_path, 'rb') as f:
-                data = f.read()
-            
-            # Look for EOF marker at the end
-            marker = b'EOFSTEGO'
-            index = data.rfind(marker)
-            
-            if index == -1:
-                raise Exception("No EOF marker found")
-            
-            # Read message length
-            len_start = index + len(marker)
-            message_len = struct.unpack('<I', data[len_start:len_start+4])[0]
-            
-            # Read message
-            message_start = len_start + 4
-            message_end = message_start + message_len
-            
-            if message_end != len(data):
-                raise Exception("Invalid EOF data - not at actual end of file")
-            
-            encrypted_message = data[message_start:message_end].decode('utf-8')
-            return encrypted_message
+            if f is None:
+                with open(video_path, 'rb') as f:
+                    return self._eof_read_message(f)
+            return self._eof_read_message(f)
             
         except Exception as e:
             raise Exception(f"EOF decoding failed: {str(e)}")
     
+    def _eof_read_message(self, f):
+        """Message from the fixed trailer, or from the legacy marker + length + message layout"""
+        size = f.seek(0, os.SEEK_END)
+        
+        # Current layout: message, then <length, marker> as the last bytes
+        if size >= EOF_TRAILER.size:
+            f.seek(size - EOF_TRAILER.size)
+            message_len, marker = EOF_TRAILER.unpack(f.read(EOF_TRAILER.size))
+            if marker == EOF_MARKER:
+                if message_len > size - EOF_TRAILER.size:
+                    raise Exception("Invalid EOF data - length exceeds file size")
+                f.seek(size - EOF_TRAILER.size - message_len)
+                return f.read(message_len).decode('utf-8')
+        
+        # Legacy layout: marker, length, message running to the end; scan back in chunks
+        tail = b''
+        pos = size
+        while pos > 0 and size - pos < EOF_LEGACY_SCAN:
+            step = min(EOF_SCAN_CHUNK, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            
+            # Markers starting in the new chunk (they may run into the previous one)
+            index = tail.rfind(EOF_MARKER, 0, step + len(EOF_MARKER) - 1)
+            while index != -1:
+                len_start = index + len(EOF_MARKER)
+                if len_start + 4 <= len(tail):
+                    message_len = struct.unpack('<I', tail[len_start:len_start + 4])[0]
+                    if len_start + 4 + message_len == len(tail):
+                        return tail[len_start + 4:].decode('utf-8')
+                index = tail.rfind(EOF_MARKER, 0, index + len(EOF_MARKER) - 1)
+        
+        raise Exception("No EOF marker found")
+    
+    # ===== AUTO-DETECT =====
+    
+    def _probe_carrier(self, video_path, failures):
+        """EOF, metadata and LSB auto-detect in cost order, sharing one open handle.
+        
+        Checks the EOF trailer, then moov (or the last MiB of other containers),
+        then the LSB header of the first frame, and hands the match to its
+        extractor. Returns (method, message), or ("Unknown", "") after appending
+        why each method was ruled out to failures. A clean file costs a few
+        small reads and one decoded frame.
+        """
+        with open(video_path, 'rb') as f:
+            try:
+                return "EOF", self._eof_read_message(f)
+            except Exception as e:
+                failures.append(f"EOF: {e}")
+            
+            try:
+                return "Metadata", self._metadata_read_message(f, EOF_LEGACY_SCAN)
+            except Exception as e:
+                failures.append(f"Metadata: {e}")
+        
+        # The LSB reader gives up after the first frame unless it carries a header
+        cap = cv2.VideoCapture(video_path)
+        try:
+            if not cap.isOpened():
+                raise Exception("Cannot open video file")
+            return "LSB", self._lsb_read_message(cap, video_path)
+        except Exception as e:
+            failures.append(f"LSB: {e}")
+        finally:
+            cap.release()
+        
+        return "Unknown", ""
+    
+    # ===== BACKGROUND JOB HELPERS =====
+    
+    def _start_job(self, target, *args):
+        """Run target on a worker thread and start draining its UI queue"""
+        threading.Thread(target=target, args=args, daemon=True).start()
+        self.after(50, self._poll_job_queue)
+    
+    def _post(self, handler, *args):
+        """Queue a UI update for the Tk thread (worker side)"""
+        self.job_queue.put((handler, args))
+    
+    def _poll_job_queue(self):
+        """Apply queued worker updates on the Tk thread; of a run of progress updates only the last is drawn"""
+        progress = None
+        try:
+            while True:
+                handler, args = self.job_queue.get_nowait()
+                if handler == self._show_progress:
+                    progress = args
+                    continue
+                if progress:
+                    self._show_progress(*progress)
+                    progress = None
+                handler(*args)
+        except queue.Empty:
+            pass
+        if progress:
+            self._show_progress(*progress)
+        
+        if self.encoding_in_progress or self.decoding_in_progress:
+            self.after(50, self._poll_job_queue)
+    
+    def _report_progress(self, done, total, text, started):
+        """Post frame progress with speed and time left from a worker (total may be unknown)"""
+        elapsed = time.time() - started
+        fps = done / elapsed if elapsed > 0 else 0.0
+        if total > 0:
+            percent = min(100, (done / total) * 100)
+            remaining = int((total - done) / fps) if fps > 0 else 0
+            status = f"{text} {done}/{total} ({percent:.0f}%, {fps:.1f} fps, ETA {remaining // 60}:{remaining % 60:02d})"
+        else:
+            percent = 0
+            status = f"{text} {done} ({fps:.1f} fps)"
+        self._post(self._show_progress, percent, status)
+    
+    def _show_progress(self, percent, text):
+        """Update progress bar and status (Tk thread)"""
+        self.progress_var.set(int(percent))
+        self.update_status(text, "info")
+    
     # ===== MAIN ENCODE/DECODE FUNCTIONS =====
     
     def encode_message(self):
@@ -1411,6 +2545,8 @@ class VideoPage(tk.Frame):
             secret_text = self.secret_text.get("1.0", "end-1c").strip()
             password = self.hide_password.get()
             method = self.method_var.get()
+            # LSB settings are read here too; the worker thread only gets their values
+            lsb_settings = self._lsb_settings() if method == "LSB" else None
             
             # Validate inputs
             validation_errors = []
@@ -1442,35 +2578,35 @@ class VideoPage(tk.Frame):
             self.update_status(f"Starting {method} encoding...", "info")
             
             # Start encoding in thread
-            threading.Thread(target=self._encode_thread, 
-                           args=(source_file, output_file, secret_text, password, method),
-                           daemon=True).start()
+            self._start_job(self._encode_thread, source_file, output_file, secret_text, password, method,
+                            lsb_settings)
             
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred:\n\n{str(e)}")
             self.update_status("Encoding failed", "error")
             self.encoding_in_progress = False
     
-    def _encode_thread(self, source_file, output_file, secret_text, password, method):
+    def _encode_thread(self, source_file, output_file, secret_text, password, method, lsb_settings=None):
         """Encoding thread function"""
+        self.encode_stats = None
         try:
             # Encode based on method
             if method == "LSB":
-                success = self.lsb_encode(source_file, secret_text, output_file)
+                success = self.lsb_encode(source_file, secret_text, output_file, password, **lsb_settings)
             elif method == "Metadata":
-                success = self.metadata_encode(source_file, secret_text, output_file)
+                success = self.metadata_encode(source_file, secret_text, output_file, password)
             elif method == "EOF":
-                success = self.eof_encode(source_file, secret_text, output_file)
+                success = self.eof_encode(source_file, secret_text, output_file, password)
             else:
                 raise ValueError(f"Unknown method: {method}")
             
             if success:
-                self.after(0, self._encode_success, output_file, password, method, len(secret_text))
+                self._post(self._encode_success, output_file, password, method, len(secret_text))
             else:
-                self.after(0, self._encode_failed)
+                self._post(self._encode_failed)
                 
         except Exception as e:
-            self.after(0, self._encode_error, str(e))
+            self._post(self._encode_error, str(e))
     
     def _encode_success(self, output_file, password, method, msg_length):
         """Handle successful encoding"""
@@ -1479,12 +2615,19 @@ class VideoPage(tk.Frame):
         
         # Show success
         video_size = os.path.getsize(output_file) / (1024 * 1024)  # MB
+        stats = self.encode_stats
+        encode_line = ""
+        if stats:
+            encode_line = f"• Encode: {stats['codec']}, {stats['seconds']:.1f} s at {stats['fps']:.1f} fps\n"
+            if stats.get('reencoded') is not None:
+                encode_line += f"• Re-encoded {stats['reencoded']} frames, copied the rest\n"
         messagebox.showinfo(
             "Success",
             f"✅ Message encoded successfully!\n\n"
             f"• Method: {method}\n"
             f"• Output: {os.path.basename(output_file)}\n"
             f"• Size: {video_size:.1f} MB\n"
+            f"{encode_line}"
             f"• Message length: {msg_length} characters\n\n"
             f"⚠️ Remember your encryption key for extraction!"
         )
@@ -1522,6 +2665,7 @@ class VideoPage(tk.Frame):
             # Get inputs
             encoded_file = self.encoded_entry.get()
             password = self.extract_password.get()
+            decode_method = self.decode_method_var.get()
             
             # Validate inputs
             if not encoded_file or "Select encoded video" in encoded_file:
@@ -1543,45 +2687,27 @@ class VideoPage(tk.Frame):
             self.update_status("Starting decoding...", "info")
             
             # Start decoding in thread
-            threading.Thread(target=self._decode_thread, 
-                           args=(encoded_file, password),
-                           daemon=True).start()
+            self._start_job(self._decode_thread, encoded_file, password, decode_method)
             
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred:\n\n{str(e)}")
             self.update_status("Decoding failed", "error")
             self.decoding_in_progress = False
     
-    def _decode_thread(self, encoded_file, password):
+    def _decode_thread(self, encoded_file, password, decode_method):
         """Decoding thread function"""
         try:
             extracted_encrypted = ""
             method_used = "Unknown"
             
             # Try different methods based on selection
-            decode_method = self.decode_method_var.get()
-            
             if decode_method == "Auto":
-                # Try methods in order of reliability
-                methods_to_try = [
-                    ("EOF", self.eof_decode),
-                    ("Metadata", self.metadata_decode),
-                    ("LSB", self.lsb_decode)
-                ]
-                
-                for method_name, decode_func in methods_to_try:
-                    try:
-                        self.update_status(f"Trying {method_name} method...", "info")
-                        extracted_encrypted = decode_func(encoded_file)
-                        if extracted_encrypted:
-                            method_used = method_name
-                            break
-                    except Exception as e:
-                        print(f"{method_name} decode failed: {e}")
-                        continue
+                # One probe pass: trailer, container boxes, then the first frame
+                failures = []
+                method_used, extracted_encrypted = self._probe_carrier(encoded_file, failures)
                 
                 if not extracted_encrypted:
-                    raise Exception("Could not extract message with any method")
+                    raise Exception("Could not extract message with any method:\n" + "\n".join(failures))
             
             elif decode_method == "LSB":
                 extracted_encrypted = self.lsb_decode(encoded_file)
@@ -1598,10 +2724,10 @@ class VideoPage(tk.Frame):
             # Decrypt the message
             decrypted_text = self.decrypt_message(extracted_encrypted, password)
             
-            self.after(0, self._decode_success, decrypted_text, method_used)
+            self._post(self._decode_success, decrypted_text, method_used)
             
         except Exception as e:
-            self.after(0, self._decode_error, str(e))
+            self._post(self._decode_error, str(e))
     
     def _decode_success(self, decrypted_text, method_used):
         """Handle successful decoding"""
@@ -1720,6 +2846,7 @@ class VideoPage(tk.Frame):
         
         # Reset state variables
         self.source_video_path = ""
+        self.source_frames = None
         self.output_video_path = ""
         
         # Reset method selections